@@ -3,18 +3,40 @@
 
 import json
 import sys
-import zipfile
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional, Any
 
-from lib import load_changelog
+from lib import check_required, parse_options, write_json
 
 
 # Campaign data
 campaign_config: Dict[str, Any] = {}
 campaign_state: Dict[str, Any] = {}
 
+# Commands that take a subcommand as their first positional argument
+SUBCOMMAND_CMDS = frozenset({"branch", "state", "changelog"})
+
+FLAGS = {
+    "--json": ("output_json", False),
+    "--calendar": ("calendar_type", True),
+    "--from": ("from_branch", True),
+    "--branch": ("branch", True),
+    "--protagonists": ("protagonists", True),
+    "--character": ("character", True),
+    "--session": ("session", True),
+    "--field": ("field", True),
+    "--tier": ("tier", True),
+    "--reason": ("reason", True),
+    "--limit": ("limit", True),
+    "--output": ("output", True),
+    "--into": ("into", True),
+}
+
+# Commands that read the campaign config / state before running
+CONFIG_COMMANDS = frozenset({"show", "export", "branch"})
+STATE_COMMANDS = frozenset({"branch", "state"})
+
 
 def load_config(search_root: Path) -> Dict[str, Any]:
     """Load campaign configuration."""
@@ -36,8 +58,7 @@ def save_config(search_root: Path, config: Dict[str, Any]) -> None:
     config_dir.mkdir(exist_ok=True)
 
     config_path = config_dir / "config.json"
-    with open(config_path, 'w', encoding='utf-8') as f:
-        json.dump(config, f, indent=2)
+    write_json(config_path, config)
 
 
 def load_state(search_root: Path) -> Dict[str, Any]:
@@ -60,8 +81,7 @@ def save_state(search_root: Path, state: Dict[str, Any]) -> None:
     state_dir.mkdir(exist_ok=True)
 
     state_path = state_dir / "state.json"
-    with open(state_path, 'w', encoding='utf-8') as f:
-        json.dump(state, f, indent=2)
+    write_json(state_path, state)
 
 
 def cmd_init(
@@ -151,8 +171,9 @@ def cmd_branch_switch(branch_id: str, output_json: bool = False) -> None:
         print(f"Error: Branch '{branch_id}' not found", file=sys.stderr)
         sys.exit(1)
 
-    campaign_state["active_branch"] = branch_id
-    save_state(Path.cwd(), campaign_state)
+    if campaign_state.get("active_branch") != branch_id:
+        campaign_state["active_branch"] = branch_id
+        save_state(Path.cwd(), campaign_state)
 
     if output_json:
         print(json.dumps({"active_branch": branch_id}, indent=2))
@@ -254,6 +275,7 @@ def cmd_state_set(
     # Split comma-separated characters, filtering empty strings
     char_list = [c.strip() for c in characters.split(',') if c.strip()]
     results = []
+    changed = 0
 
     # Check if characters exist (warn if not, but proceed)
     from lib import discover_data
@@ -263,6 +285,7 @@ def cmd_state_set(
         if character.lower() not in existing_char_keys_lower:
             print(f"Note: No character file found for '{character}'", file=sys.stderr)
 
+    from lib import load_changelog
     changelog = load_changelog(Path.cwd())
 
     for character in char_list:
@@ -270,6 +293,17 @@ def cmd_state_set(
             campaign_state["characters"][character] = {}
 
         old_value = campaign_state["characters"][character].get(field)
+
+        # Setting a field to its current value is not a change
+        if field in campaign_state["characters"][character] and old_value == value:
+            results.append({
+                "character": character,
+                "field": field,
+                "value": value,
+                "noop": True
+            })
+            continue
+
         campaign_state["characters"][character][field] = value
 
         # Record in changelog
@@ -281,7 +315,8 @@ def cmd_state_set(
             from_value=old_value,
             to_value=value,
             reason=reason,
-            branch=campaign_state.get("active_branch")
+            branch=campaign_state.get("active_branch"),
+            save=False
         )
 
         results.append({
@@ -290,17 +325,22 @@ def cmd_state_set(
             "value": value,
             "change_id": entry.id
         })
+        changed += 1
 
-    if results:
+    if changed:
         save_state(Path.cwd(), campaign_state)
+        changelog.save()
 
     if output_json:
         print(json.dumps(results, indent=2))
     else:
         for r in results:
-            print(f"Set {r['character']}.{r['field']} = {r['value']}")
-        if results:
-            print(f"Changes logged: {len(results)}")
+            if r.get("noop"):
+                print(f"No change for {r['character']}.{r['field']}")
+            else:
+                print(f"Set {r['character']}.{r['field']} = {r['value']}")
+        if changed:
+            print(f"Changes logged: {changed}")
 
 
 def cmd_state_delete(
@@ -322,6 +362,7 @@ def cmd_state_delete(
     results = []
     errors = []
 
+    from lib import load_changelog
     changelog = load_changelog(Path.cwd())
 
     for character in char_list:
@@ -349,7 +390,8 @@ def cmd_state_delete(
             from_value=old_value,
             to_value=None,
             reason=reason,
-            branch=campaign_state.get("active_branch")
+            branch=campaign_state.get("active_branch"),
+            save=False
         )
 
         results.append({
@@ -363,6 +405,7 @@ def cmd_state_delete(
     # Save state if any changes were made
     if results:
         save_state(Path.cwd(), campaign_state)
+        changelog.save()
 
     if output_json:
         print(json.dumps({"results": results, "errors": errors}, indent=2))
@@ -388,18 +431,23 @@ def cmd_changelog_show(
     output_json: bool = False
 ) -> None:
     """Show changelog entries."""
+    from lib import load_changelog
     changelog = load_changelog(Path.cwd())
 
     entries = changelog.entries.copy()
 
     if character:
-        entries = [e for e in entries if e.character.lower() == character.lower()]
+        character_lower = character.lower()
+        entries = [e for e in entries if e.character.lower() == character_lower]
     if session:
-        entries = [e for e in entries if e.session.lower() == session.lower()]
+        session_lower = session.lower()
+        entries = [e for e in entries if e.session.lower() == session_lower]
     if field:
-        entries = [e for e in entries if field.lower() in e.field.lower()]
+        field_lower = field.lower()
+        entries = [e for e in entries if field_lower in e.field.lower()]
     if tier:
-        entries = [e for e in entries if e.tier.lower() == tier.lower()]
+        tier_lower = tier.lower()
+        entries = [e for e in entries if e.tier.lower() == tier_lower]
 
     if limit > 0:
         entries = entries[-limit:]
@@ -428,6 +476,8 @@ def cmd_export(
     output_json: bool = False
 ) -> None:
     """Export campaign to a zip archive."""
+    import zipfile
+
     search_root = Path.cwd()
 
     # Generate default filename from campaign name and date
@@ -511,6 +561,8 @@ def cmd_import(
     output_json: bool = False
 ) -> None:
     """Import campaign from a zip archive."""
+    import zipfile
+
     source = Path(zip_path)
     if not source.exists():
         print(f"Error: File not found: {zip_path}", file=sys.stderr)
@@ -562,45 +614,147 @@ def cmd_import(
                 print(f"  {dir_name}: {count} files")
 
 
+# Keyed by "command.subcommand" for commands with subcommands: the number of
+# positional arguments needed, with the error shown when fewer are given
+REQUIRED_ARGS = {
+    "init": (1, "campaign name required"),
+    "import": (1, "zip file path required"),
+    "branch.switch": (1, "branch ID required"),
+    "branch.create": (2, "branch ID and name required"),
+    "state.set": (3, "character, field, and value required"),
+    "state.delete": (2, "character and field required"),
+}
+
+REQUIRED = {
+    "state.set": (
+        ("reason", "--reason is required for state changes"),
+    ),
+    "state.delete": (
+        ("reason", "--reason is required for state changes"),
+    ),
+}
+
+
+def run_init(opts: Dict[str, Any]) -> None:
+    """Run the init command from parsed options."""
+    cmd_init(opts["args"][0], opts["calendar_type"], opts["output_json"])
+
+
+def run_show(opts: Dict[str, Any]) -> None:
+    """Run the show command from parsed options."""
+    cmd_show(opts["output_json"])
+
+
+def run_export(opts: Dict[str, Any]) -> None:
+    """Run the export command from parsed options."""
+    cmd_export(opts["output"], opts["output_json"])
+
+
+def run_import(opts: Dict[str, Any]) -> None:
+    """Run the import command from parsed options."""
+    cmd_import(opts["args"][0], opts["into"], opts["output_json"])
+
+
+def run_branch_list(opts: Dict[str, Any]) -> None:
+    """Run the branch list command from parsed options."""
+    cmd_branch_list(opts["output_json"])
+
+
+def run_branch_switch(opts: Dict[str, Any]) -> None:
+    """Run the branch switch command from parsed options."""
+    cmd_branch_switch(opts["args"][0], opts["output_json"])
+
+
+def run_branch_create(opts: Dict[str, Any]) -> None:
+    """Run the branch create command from parsed options."""
+    args = opts["args"]
+    cmd_branch_create(
+        args[0], args[1],
+        opts["from_branch"], opts["protagonists"],
+        opts["output_json"]
+    )
+
+
+def run_state_show(opts: Dict[str, Any]) -> None:
+    """Run the state show command from parsed options."""
+    cmd_state_show(opts["character"], opts["branch"], opts["output_json"])
+
+
+def run_state_set(opts: Dict[str, Any]) -> None:
+    """Run the state set command from parsed options."""
+    args = opts["args"]
+    cmd_state_set(
+        args[0], args[1], args[2],
+        opts["reason"], opts["session"], opts["output_json"]
+    )
+
+
+def run_state_delete(opts: Dict[str, Any]) -> None:
+    """Run the state delete command from parsed options."""
+    args = opts["args"]
+    cmd_state_delete(
+        args[0], args[1],
+        opts["reason"], opts["session"], opts["output_json"]
+    )
+
+
+def run_changelog_show(opts: Dict[str, Any]) -> None:
+    """Run the changelog show command from parsed options."""
+    cmd_changelog_show(
+        opts["character"], opts["session"], opts["field"],
+        opts["tier"], opts["limit"], opts["output_json"]
+    )
+
+
+# Commands with subcommands are keyed "command.subcommand"
+COMMANDS = {
+    "init": run_init,
+    "show": run_show,
+    "export": run_export,
+    "import": run_import,
+    "branch.list": run_branch_list,
+    "branch.switch": run_branch_switch,
+    "branch.create": run_branch_create,
+    "state.show": run_state_show,
+    "state.set": run_state_set,
+    "state.delete": run_state_delete,
+    "changelog.show": run_changelog_show,
+}
+
+
+HELP = """\
+Usage: python campaign.py <command> [options]
+
+Commands:
+  init <name>                    Initialize new campaign
+  show                           Show campaign config
+  export [--output FILE.zip]     Export campaign to zip
+  import <file.zip> [--into DIR] Import campaign from zip
+  branch list                    List all branches
+  branch switch <id>             Switch active branch
+  branch create <id> <name>      Create new branch
+  state show [--character X] [--branch Y]  Show campaign state
+  state set <chars> <field> <val>   Set character state
+  state delete <chars> <field>      Delete character state field
+  changelog show [filters...]    Show changelog entries
+
+State commands accept comma-separated characters:
+  state set kira,dex,tam location "station" --reason "Docked"
+  state delete kira,dex condition.wounded --reason "Healed"
+
+Global options:
+  --json                         Output as JSON
+"""
+
+
 def main():
     global campaign_config, campaign_state
 
-    search_root = Path.cwd()
-    campaign_config = load_config(search_root)
-    campaign_state = load_state(search_root)
-
     if len(sys.argv) < 2 or sys.argv[1] in ('--help', '-h'):
-        print("Usage: python campaign.py <command> [options]")
-        print("\nCommands:")
-        print("  init <name>                    Initialize new campaign")
-        print("  show                           Show campaign config")
-        print("  export [--output FILE.zip]     Export campaign to zip")
-        print("  import <file.zip> [--into DIR] Import campaign from zip")
-        print("  branch list                    List all branches")
-        print("  branch switch <id>             Switch active branch")
-        print("  branch create <id> <name>      Create new branch")
-        print("  state show [--character X] [--branch Y]  Show campaign state")
-        print("  state set <chars> <field> <val>   Set character state")
-        print("  state delete <chars> <field>      Delete character state field")
-        print("  changelog show [filters...]    Show changelog entries")
-        print("\nState commands accept comma-separated characters:")
-        print("  state set kira,dex,tam location \"station\" --reason \"Docked\"")
-        print("  state delete kira,dex condition.wounded --reason \"Healed\"")
-        print("\nGlobal options:")
-        print("  --json                         Output as JSON")
+        sys.stdout.write(HELP)
         sys.exit(0 if len(sys.argv) > 1 and sys.argv[1] in ('--help', '-h') else 1)
 
-    # Commands that use subcommands
-    SUBCOMMAND_CMDS = {'branch', 'state', 'changelog'}
-
     command = sys.argv[1]
-    subcommand = None
-
-    if command in SUBCOMMAND_CMDS and len(sys.argv) > 2 and not sys.argv[2].startswith("--"):
-        subcommand = sys.argv[2]
-        i = 3
-    else:
-        i = 2
 
     # Parse options
     opts = {
@@ -622,137 +776,44 @@ def main():
         "output_json": False,
     }
 
-    positional = []
-    while i < len(sys.argv):
-        arg = sys.argv[i]
-        if arg == "--json":
-            opts["output_json"] = True
-            i += 1
-        elif arg == "--calendar" and i + 1 < len(sys.argv):
-            opts["calendar_type"] = sys.argv[i + 1]
-            i += 2
-        elif arg == "--from" and i + 1 < len(sys.argv):
-            opts["from_branch"] = sys.argv[i + 1]
-            i += 2
-        elif arg == "--branch" and i + 1 < len(sys.argv):
-            opts["branch"] = sys.argv[i + 1]
-            i += 2
-        elif arg == "--protagonists" and i + 1 < len(sys.argv):
-            opts["protagonists"] = sys.argv[i + 1]
-            i += 2
-        elif arg == "--character" and i + 1 < len(sys.argv):
-            opts["character"] = sys.argv[i + 1]
-            i += 2
-        elif arg == "--session" and i + 1 < len(sys.argv):
-            opts["session"] = sys.argv[i + 1]
-            i += 2
-        elif arg == "--field" and i + 1 < len(sys.argv):
-            opts["field"] = sys.argv[i + 1]
-            i += 2
-        elif arg == "--tier" and i + 1 < len(sys.argv):
-            opts["tier"] = sys.argv[i + 1]
-            i += 2
-        elif arg == "--reason" and i + 1 < len(sys.argv):
-            opts["reason"] = sys.argv[i + 1]
-            i += 2
-        elif arg == "--limit" and i + 1 < len(sys.argv):
-            opts["limit"] = int(sys.argv[i + 1])
-            i += 2
-        elif arg == "--output" and i + 1 < len(sys.argv):
-            opts["output"] = sys.argv[i + 1]
-            i += 2
-        elif arg == "--into" and i + 1 < len(sys.argv):
-            opts["into"] = sys.argv[i + 1]
-            i += 2
-        elif not arg.startswith("--"):
-            positional.append(arg)
-            i += 1
-        else:
-            print(f"Unknown option: {arg}", file=sys.stderr)
-            sys.exit(1)
-
-    # Execute command
-    if command == "init":
-        if not positional:
-            print("Error: campaign name required", file=sys.stderr)
-            sys.exit(1)
-        cmd_init(positional[0], opts["calendar_type"], opts["output_json"])
+    positional = parse_options(sys.argv[2:], FLAGS, opts)
 
-    elif command == "show":
-        cmd_show(opts["output_json"])
+    # Subcommands are dispatched as "command.subcommand"
+    cmd_key = command
+    if command in SUBCOMMAND_CMDS:
+        subcommand = positional.pop(0) if positional else None
+        cmd_key = f"{command}.{subcommand}"
+    opts["args"] = positional
 
-    elif command == "export":
-        cmd_export(opts["output"], opts["output_json"])
+    try:
+        opts["limit"] = int(opts["limit"])
+    except ValueError:
+        print("Error: --limit requires an integer value", file=sys.stderr)
+        sys.exit(1)
 
-    elif command == "import":
-        if not positional:
-            print("Error: zip file path required", file=sys.stderr)
-            sys.exit(1)
-        cmd_import(positional[0], opts["into"], opts["output_json"])
-
-    elif command == "branch":
-        if subcommand == "list":
-            cmd_branch_list(opts["output_json"])
-        elif subcommand == "switch":
-            if not positional:
-                print("Error: branch ID required", file=sys.stderr)
-                sys.exit(1)
-            cmd_branch_switch(positional[0], opts["output_json"])
-        elif subcommand == "create":
-            if len(positional) < 2:
-                print("Error: branch ID and name required", file=sys.stderr)
-                sys.exit(1)
-            cmd_branch_create(
-                positional[0], positional[1],
-                opts["from_branch"], opts["protagonists"],
-                opts["output_json"]
-            )
+    handler = COMMANDS.get(cmd_key)
+    if handler is None:
+        if command in SUBCOMMAND_CMDS:
+            print(f"Unknown {command} subcommand: {subcommand}", file=sys.stderr)
         else:
-            print(f"Unknown branch subcommand: {subcommand}", file=sys.stderr)
-            sys.exit(1)
+            print(f"Unknown command: {command}", file=sys.stderr)
+        sys.exit(1)
 
-    elif command == "state":
-        if subcommand == "show":
-            cmd_state_show(opts["character"], opts["branch"], opts["output_json"])
-        elif subcommand == "set":
-            if len(positional) < 3:
-                print("Error: character, field, and value required", file=sys.stderr)
-                sys.exit(1)
-            if not opts["reason"]:
-                print("Error: --reason is required for state changes", file=sys.stderr)
-                sys.exit(1)
-            cmd_state_set(
-                positional[0], positional[1], positional[2],
-                opts["reason"], opts["session"], opts["output_json"]
-            )
-        elif subcommand == "delete":
-            if len(positional) < 2:
-                print("Error: character and field required", file=sys.stderr)
-                sys.exit(1)
-            if not opts["reason"]:
-                print("Error: --reason is required for state changes", file=sys.stderr)
-                sys.exit(1)
-            cmd_state_delete(
-                positional[0], positional[1],
-                opts["reason"], opts["session"], opts["output_json"]
-            )
-        else:
-            print(f"Unknown state subcommand: {subcommand}", file=sys.stderr)
+    if cmd_key in REQUIRED_ARGS:
+        count, message = REQUIRED_ARGS[cmd_key]
+        if len(positional) < count:
+            print(f"Error: {message}", file=sys.stderr)
             sys.exit(1)
+    check_required(REQUIRED, cmd_key, opts)
 
-    elif command == "changelog":
-        if subcommand == "show":
-            cmd_changelog_show(
-                opts["character"], opts["session"], opts["field"],
-                opts["tier"], opts["limit"], opts["output_json"]
-            )
-        else:
-            print(f"Unknown changelog subcommand: {subcommand}", file=sys.stderr)
-            sys.exit(1)
+    # Load only the campaign files this command reads
+    search_root = Path.cwd()
+    if command in CONFIG_COMMANDS:
+        campaign_config = load_config(search_root)
+    if command in STATE_COMMANDS:
+        campaign_state = load_state(search_root)
 
-    else:
-        print(f"Unknown command: {command}", file=sys.stderr)
-        sys.exit(1)
+    handler(opts)
 
 
 if __name__ == "__main__":
@@ -2,17 +2,27 @@
 """Character tool for solo RPG games. Provides incremental character data loading."""
 
 import json
-import subprocess
 import sys
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Dict, Iterator, List, Optional, Any
 
-from lib import discover_data, find_item, load_changelog, save_item, delete_item_file
+from lib import discover_data, find_item, parse_json_value, parse_options, check_required, save_item, find_source_file, delete_item_file, write_item
 
 
 # Character storage
 characters: Dict[str, Dict] = {}
 
+# Plain-text fields of "full" that format_full renders under their own headings, in order
+FULL_SECTIONS = (
+    ("appearance", "Appearance"),
+    ("personality", "Personality"),
+    ("background", "Background"),
+    ("motivations", "Motivations"),
+)
+
+# Fields of "full" that format_full renders with their own headings
+FULL_FIELDS = frozenset([key for key, _ in FULL_SECTIONS] + ["voice_samples"])
+
 
 def discover_characters(search_root: Path) -> None:
     """Discover character files from characters/ folder."""
@@ -43,7 +53,7 @@ def filter_characters(
             print("Error: --tag cannot be empty", file=sys.stderr)
             sys.exit(1)
         tag_lower = tag.lower()
-        result = [c for c in result if tag_lower in [t.lower() for t in c.get("tags", [])]]
+        result = [c for c in result if any(t.lower() == tag_lower for t in c.get("tags", []))]
 
     if location:
         # Check current location from campaign state
@@ -67,9 +77,10 @@ def filter_characters(
                 with open(config_path, encoding='utf-8-sig') as f:
                     config = json.load(f)
                     branches = config.get("branches", [])
-                    branch_data = next((b for b in branches if b["id"].lower() == branch.lower()), None)
+                    branch_lower = branch.lower()
+                    branch_data = next((b for b in branches if b["id"].lower() == branch_lower), None)
                     if branch_data:
-                        protagonists = [p.lower() for p in branch_data.get("protagonists", [])]
+                        protagonists = {p.lower() for p in branch_data.get("protagonists", [])}
                         result = [c for c in result if c.get("id", "").lower() in protagonists]
             except (FileNotFoundError, json.JSONDecodeError, KeyError):
                 pass
@@ -111,17 +122,7 @@ def format_full(char: Dict) -> str:
 
     full = char.get("full", {})
 
-    if full.get("appearance"):
-        lines.append(f"\n## Appearance\n{full['appearance']}")
-
-    if full.get("personality"):
-        lines.append(f"\n## Personality\n{full['personality']}")
-
-    if full.get("background"):
-        lines.append(f"\n## Background\n{full['background']}")
-
-    if full.get("motivations"):
-        lines.append(f"\n## Motivations\n{full['motivations']}")
+    lines.extend(f"\n## {title}\n{full[key]}" for key, title in FULL_SECTIONS if full.get(key))
 
     if full.get("voice_samples"):
         lines.append("\n## Voice Samples")
@@ -134,45 +135,40 @@ def format_full(char: Dict) -> str:
                 lines.append(f"- \"{sample}\"")
 
     # Handle any additional fields in full
-    known_fields = {"appearance", "personality", "background", "motivations", "voice_samples"}
-    for key, value in full.items():
-        if key not in known_fields:
-            lines.append(f"\n## {key.replace('_', ' ').title()}\n{value}")
+    lines.extend(f"\n## {key.replace('_', ' ').title()}\n{value}"
+                 for key, value in full.items() if key not in FULL_FIELDS)
 
     return "\n".join(lines)
 
 
-def format_value(value: Any, indent: int = 0) -> List[str]:
-    """Recursively format a value, handling nested dicts and lists."""
+def format_value(value: Any, indent: int = 0) -> Iterator[str]:
+    """Recursively format a value as lines, handling nested dicts and lists."""
     prefix = "  " * indent
-    lines = []
 
     if isinstance(value, dict):
         for k, v in value.items():
             if isinstance(v, dict):
-                lines.append(f"{prefix}**{k}:**")
-                lines.extend(format_value(v, indent + 1))
+                yield f"{prefix}**{k}:**"
+                yield from format_value(v, indent + 1)
             elif isinstance(v, list):
-                lines.append(f"{prefix}**{k}:**")
+                yield f"{prefix}**{k}:**"
                 for item in v:
                     if isinstance(item, dict):
-                        lines.append(f"{prefix}  -")
-                        lines.extend(format_value(item, indent + 2))
+                        yield f"{prefix}  -"
+                        yield from format_value(item, indent + 2)
                     else:
-                        lines.append(f"{prefix}  - {item}")
+                        yield f"{prefix}  - {item}"
             else:
-                lines.append(f"{prefix}**{k}:** {v}")
+                yield f"{prefix}**{k}:** {v}"
     elif isinstance(value, list):
         for item in value:
             if isinstance(item, dict):
-                lines.append(f"{prefix}-")
-                lines.extend(format_value(item, indent + 1))
+                yield f"{prefix}-"
+                yield from format_value(item, indent + 1)
             else:
-                lines.append(f"{prefix}- {item}")
+                yield f"{prefix}- {item}"
     else:
-        lines.append(f"{prefix}{value}")
-
-    return lines
+        yield f"{prefix}{value}"
 
 
 def format_section(char: Dict, section_name: str) -> str:
@@ -234,20 +230,19 @@ def cmd_list(
     filtered.sort(key=lambda c: (c.get("name") or c.get("id") or ""))
 
     if short:
-        # Show minimal profiles
-        for char in filtered:
-            print(format_minimal(char))
-            print()
+        # Show minimal profiles, each followed by a blank line
+        sys.stdout.write("".join(f"{format_minimal(char)}\n\n" for char in filtered))
     else:
         # Just names
-        print("Characters:")
+        lines = ["Characters:"]
         for char in filtered:
             name = char.get("name", char.get("id", "Unknown"))
             faction_str = char.get("faction", "")
             tags = char.get("tags", [])
             tag_str = f" [{', '.join(tags)}]" if tags else ""
             faction_display = f" ({faction_str})" if faction_str else ""
-            print(f"  - {name}{faction_display}{tag_str}")
+            lines.append(f"  - {name}{faction_display}{tag_str}")
+        print("\n".join(lines))
 
         print(f"\nTotal: {len(filtered)} characters")
         print("Use --short for minimal profiles, or 'get <name>' for details")
@@ -295,6 +290,8 @@ def cmd_memories(char_name: str) -> None:
     # Find character to validate name exists
     find_item(characters, char_name, "Character")
 
+    import subprocess
+
     # Call memories.py to show memories for this character
     script_dir = Path(__file__).parent
     memories_script = script_dir / "memories.py"
@@ -334,38 +331,37 @@ def cmd_update(
     old_value = target.get(final_key)
 
     # Try to parse value as JSON (for arrays/objects)
-    parsed_value = value
-    if value.startswith('{') or value.startswith('['):
-        try:
-            parsed_value = json.loads(value)
-        except json.JSONDecodeError:
-            pass  # Keep as string
+    try:
+        parsed_value = parse_json_value(value)
+    except ValueError:
+        parsed_value = value  # Keep as string
+
+    # Skip the file rewrite and changelog entry when nothing would change
+    if parsed_value == old_value:
+        if output_json:
+            print(json.dumps({
+                "character": char_id,
+                "field": field,
+                "from": old_value,
+                "to": parsed_value,
+                "noop": True
+            }, indent=2))
+        else:
+            name = char.get("name", char_id)
+            print(f"No change for {name}.{field}")
+        return
 
     # Update the value
     target[final_key] = parsed_value
 
     # Find the character file and save
-    # Look in characters/ directory
     search_root = Path.cwd()
-    char_file = search_root / "characters" / f"{char_id}.json"
-
-    if not char_file.exists():
-        # Try to find it
-        for path in (search_root / "characters").glob("*.json"):
-            try:
-                with open(path, encoding='utf-8-sig') as f:
-                    data = json.load(f)
-                    if data.get("id") == char_id:
-                        char_file = path
-                        break
-            except (OSError, json.JSONDecodeError):
-                pass
-
-    if char_file.exists():
-        with open(char_file, 'w', encoding='utf-8') as f:
-            json.dump(char, f, indent=2)
+    char_file = find_source_file("characters", char_id, search_root)
+    if char_file:
+        write_item(char_file, char)
 
     # Record in changelog
+    from lib import load_changelog
     changelog = load_changelog(search_root)
     entry = changelog.add(
         session=session or "current",
@@ -508,220 +504,219 @@ def cmd_delete(char_id: str, force: bool = False) -> None:
         sys.exit(1)
 
 
-def main():
-    # Find search root (current directory or script parent)
-    search_root = Path.cwd()
+REQUIRED = {
+    "create": (
+        ("char_name", "character id required for create"),
+        ("name", "--name required for create"),
+        ("role", "--role required for create"),
+        ("essence", "--essence required for create"),
+    ),
+    "delete": (
+        ("char_name", "character id required for delete"),
+    ),
+    "get": (
+        ("char_name", "character name is required for 'get' command"),
+    ),
+    "sections": (
+        ("char_name", "character name is required for 'sections' command"),
+    ),
+    "show": (
+        ("char_name", "character name is required for 'show' command"),
+    ),
+    "memories": (
+        ("char_name", "character name is required for 'memories' command"),
+    ),
+    "update": (
+        ("char_name", "character name required"),
+        ("field", "--field required"),
+        ("value", "--value required"),
+        ("reason", "--reason required"),
+    ),
+}
+
+
+def run_create(opts: Dict[str, Any]) -> None:
+    """Run the create command from parsed options."""
+    cmd_create(
+        char_id=opts["char_name"],
+        name=opts["name"],
+        role=opts["role"],
+        essence=opts["essence"],
+        faction=opts["faction"],
+        subfaction=opts["subfaction"],
+        tags=opts["tags"],
+        voice=opts["voice"],
+        output_json=opts["output_json"]
+    )
+
+
+def run_delete(opts: Dict[str, Any]) -> None:
+    """Run the delete command from parsed options."""
+    cmd_delete(opts["char_name"], opts["force"])
+
+
+def run_list(opts: Dict[str, Any]) -> None:
+    """Run the list command from parsed options."""
+    cmd_list(opts["faction"], opts["subfaction"], opts["tag"], opts["location"],
+             opts["branch"], opts["short"])
+
+
+def run_get(opts: Dict[str, Any]) -> None:
+    """Run the get command from parsed options."""
+    cmd_get(opts["char_name"], opts["depth"], opts["section"])
+
+
+def run_sections(opts: Dict[str, Any]) -> None:
+    """Run the sections command from parsed options."""
+    cmd_sections(opts["char_name"])
+
+
+def run_show(opts: Dict[str, Any]) -> None:
+    """Run the show command from parsed options."""
+    cmd_show(opts["char_name"])
+
+
+def run_memories(opts: Dict[str, Any]) -> None:
+    """Run the memories command from parsed options."""
+    cmd_memories(opts["char_name"])
+
+
+def run_update(opts: Dict[str, Any]) -> None:
+    """Run the update command from parsed options."""
+    cmd_update(opts["char_name"], opts["field"], opts["value"], opts["reason"],
+               opts["session"], opts["output_json"])
+
+
+COMMANDS = {
+    "create": run_create,
+    "delete": run_delete,
+    "list": run_list,
+    "get": run_get,
+    "sections": run_sections,
+    "show": run_show,
+    "memories": run_memories,
+    "update": run_update,
+}
+
+
+FLAGS = {
+    "--faction": ("faction", True),
+    "--subfaction": ("subfaction", True),
+    "--tag": ("tag", True),
+    "--location": ("location", True),
+    "--branch": ("branch", True),
+    "--short": ("short", False),
+    "--depth": ("depth", True),
+    "--section": ("section", True),
+    "--field": ("field", True),
+    "--value": ("value", True),
+    "--reason": ("reason", True),
+    "--session": ("session", True),
+    "--json": ("output_json", False),
+    "--force": ("force", False),
+    "--name": ("name", True),
+    "--role": ("role", True),
+    "--essence": ("essence", True),
+    "--voice": ("voice", True),
+    "--tags": ("tags", True),
+}
+
+HELP = """\
+Usage: python characters.py <command> [options]
+
+Commands:
+  create <id> --name N --role R --essence E ...
+                                 Create a new character
+  delete <id> [--force]          Delete a character
+  list [filters...]              List character names
+  list --short [filters...]      List with minimal profiles
+  get <name>                     Get minimal profile
+  get <name> --depth full        Get full profile
+  get <name> --section NAME      Get specific section
+  sections <name>                List available sections
+  memories <name>                Show memories involving character
+  show <name>                    Show raw JSON
+  update <name> --field FIELD --value VAL --reason R
+                                 Update character field (dot notation)
+
+Create options:
+  --name NAME                    Character display name (required)
+  --role ROLE                    Character role (required)
+  --essence TEXT                 Core essence, 35 words max (required)
+  --faction NAME                 Faction/group
+  --subfaction NAME              Sub-faction
+  --tags TAGS                    Comma-separated tags
+  --voice QUOTE                  Voice sample quote
+  --json                         Output as JSON
+
+Filters (for list):
+  --faction NAME                 Filter by faction
+  --subfaction NAME              Filter by subfaction
+  --tag NAME                     Filter by tag
+  --location NAME                Filter by current location (from campaign state)
+  --branch NAME                  Filter by branch protagonists (from campaign config)
+
+Update options:
+  --field FIELD                  Field to update (dot notation, e.g., full.motivation)
+  --value VALUE                  New value (JSON arrays/objects auto-parsed)
+  --reason REASON                Reason for change
+  --session NAME                 Session identifier (optional)
+  --json                         Output as JSON
+
+  Examples:
+    --value 'Simple string'
+    --value '["item1", "item2"]'   # Parsed as JSON array
+    --value '{"key": "val"}'       # Parsed as JSON object
+"""
 
-    # Load characters
-    discover_characters(search_root)
 
-    # Parse command line
+def main():
     if len(sys.argv) < 2 or sys.argv[1] in ('--help', '-h'):
-        print("Usage: python characters.py <command> [options]")
-        print("\nCommands:")
-        print("  create <id> --name N --role R --essence E ...")
-        print("                                 Create a new character")
-        print("  delete <id> [--force]          Delete a character")
-        print("  list [filters...]              List character names")
-        print("  list --short [filters...]      List with minimal profiles")
-        print("  get <name>                     Get minimal profile")
-        print("  get <name> --depth full        Get full profile")
-        print("  get <name> --section NAME      Get specific section")
-        print("  sections <name>                List available sections")
-        print("  memories <name>                Show memories involving character")
-        print("  show <name>                    Show raw JSON")
-        print("  update <name> --field FIELD --value VAL --reason R")
-        print("                                 Update character field (dot notation)")
-        print("\nCreate options:")
-        print("  --name NAME                    Character display name (required)")
-        print("  --role ROLE                    Character role (required)")
-        print("  --essence TEXT                 Core essence, 35 words max (required)")
-        print("  --faction NAME                 Faction/group")
-        print("  --subfaction NAME              Sub-faction")
-        print("  --tags TAGS                    Comma-separated tags")
-        print("  --voice QUOTE                  Voice sample quote")
-        print("  --json                         Output as JSON")
-        print("\nFilters (for list):")
-        print("  --faction NAME                 Filter by faction")
-        print("  --subfaction NAME              Filter by subfaction")
-        print("  --tag NAME                     Filter by tag")
-        print("  --location NAME                Filter by current location (from campaign state)")
-        print("  --branch NAME                  Filter by branch protagonists (from campaign config)")
-        print("\nUpdate options:")
-        print("  --field FIELD                  Field to update (dot notation, e.g., full.motivation)")
-        print("  --value VALUE                  New value (JSON arrays/objects auto-parsed)")
-        print("  --reason REASON                Reason for change")
-        print("  --session NAME                 Session identifier (optional)")
-        print("  --json                         Output as JSON")
-        print("\n  Examples:")
-        print("    --value 'Simple string'")
-        print("    --value '[\"item1\", \"item2\"]'   # Parsed as JSON array")
-        print("    --value '{\"key\": \"val\"}'       # Parsed as JSON object")
+        sys.stdout.write(HELP)
         sys.exit(0 if len(sys.argv) > 1 and sys.argv[1] in ('--help', '-h') else 1)
 
     command = sys.argv[1]
 
     # Parse options
-    faction = None
-    subfaction = None
-    tag = None
-    location = None
-    branch = None
-    short = False
-    depth = "minimal"
-    section = None
-    field = None
-    char_name = None
-    value = None
-    reason = None
-    session_name = None
-    output_json = False
-    force = False
-    # Create-specific options
-    name = None
-    role = None
-    essence = None
-    voice = None
-    tags_list = None
-
-    i = 2
-    while i < len(sys.argv):
-        arg = sys.argv[i]
-        if arg == "--faction" and i + 1 < len(sys.argv):
-            faction = sys.argv[i + 1]
-            i += 2
-        elif arg == "--subfaction" and i + 1 < len(sys.argv):
-            subfaction = sys.argv[i + 1]
-            i += 2
-        elif arg == "--tag" and i + 1 < len(sys.argv):
-            tag = sys.argv[i + 1]
-            i += 2
-        elif arg == "--location" and i + 1 < len(sys.argv):
-            location = sys.argv[i + 1]
-            i += 2
-        elif arg == "--branch" and i + 1 < len(sys.argv):
-            branch = sys.argv[i + 1]
-            i += 2
-        elif arg == "--short":
-            short = True
-            i += 1
-        elif arg == "--depth" and i + 1 < len(sys.argv):
-            depth = sys.argv[i + 1]
-            i += 2
-        elif arg == "--section" and i + 1 < len(sys.argv):
-            section = sys.argv[i + 1]
-            i += 2
-        elif arg == "--field" and i + 1 < len(sys.argv):
-            field = sys.argv[i + 1]
-            i += 2
-        elif arg == "--value" and i + 1 < len(sys.argv):
-            value = sys.argv[i + 1]
-            i += 2
-        elif arg == "--reason" and i + 1 < len(sys.argv):
-            reason = sys.argv[i + 1]
-            i += 2
-        elif arg == "--session" and i + 1 < len(sys.argv):
-            session_name = sys.argv[i + 1]
-            i += 2
-        elif arg == "--json":
-            output_json = True
-            i += 1
-        elif arg == "--force":
-            force = True
-            i += 1
-        elif arg == "--name" and i + 1 < len(sys.argv):
-            name = sys.argv[i + 1]
-            i += 2
-        elif arg == "--role" and i + 1 < len(sys.argv):
-            role = sys.argv[i + 1]
-            i += 2
-        elif arg == "--essence" and i + 1 < len(sys.argv):
-            essence = sys.argv[i + 1]
-            i += 2
-        elif arg == "--voice" and i + 1 < len(sys.argv):
-            voice = sys.argv[i + 1]
-            i += 2
-        elif arg == "--tags" and i + 1 < len(sys.argv):
-            tags_list = sys.argv[i + 1]
-            i += 2
-        elif not arg.startswith("--"):
-            # Positional argument (character name/id)
-            char_name = arg
-            i += 1
-        else:
-            print(f"Unknown option: {arg}", file=sys.stderr)
-            sys.exit(1)
+    opts = {
+        "char_name": None,
+        "faction": None,
+        "subfaction": None,
+        "tag": None,
+        "location": None,
+        "branch": None,
+        "short": False,
+        "depth": "minimal",
+        "section": None,
+        "field": None,
+        "value": None,
+        "reason": None,
+        "session": None,
+        "output_json": False,
+        "force": False,
+        # Create-specific options
+        "name": None,
+        "role": None,
+        "essence": None,
+        "voice": None,
+        "tags": None,
+    }
 
-    # Execute command
-    if command == "create":
-        if not char_name:
-            print("Error: character id required for create", file=sys.stderr)
-            sys.exit(1)
-        if not name:
-            print("Error: --name required for create", file=sys.stderr)
-            sys.exit(1)
-        if not role:
-            print("Error: --role required for create", file=sys.stderr)
-            sys.exit(1)
-        if not essence:
-            print("Error: --essence required for create", file=sys.stderr)
-            sys.exit(1)
-        cmd_create(
-            char_id=char_name,
-            name=name,
-            role=role,
-            essence=essence,
-            faction=faction,
-            subfaction=subfaction,
-            tags=tags_list,
-            voice=voice,
-            output_json=output_json
-        )
-    elif command == "delete":
-        if not char_name:
-            print("Error: character id required for delete", file=sys.stderr)
-            sys.exit(1)
-        cmd_delete(char_name, force)
-    elif command == "list":
-        cmd_list(faction, subfaction, tag, location, branch, short)
-    elif command == "get":
-        if not char_name:
-            print("Error: character name is required for 'get' command", file=sys.stderr)
-            sys.exit(1)
-        cmd_get(char_name, depth, section)
-    elif command == "sections":
-        if not char_name:
-            print("Error: character name is required for 'sections' command", file=sys.stderr)
-            sys.exit(1)
-        cmd_sections(char_name)
-    elif command == "show":
-        if not char_name:
-            print("Error: character name is required for 'show' command", file=sys.stderr)
-            sys.exit(1)
-        cmd_show(char_name)
-    elif command == "memories":
-        if not char_name:
-            print("Error: character name is required for 'memories' command", file=sys.stderr)
-            sys.exit(1)
-        cmd_memories(char_name)
-    elif command == "update":
-        if not char_name:
-            print("Error: character name required", file=sys.stderr)
-            sys.exit(1)
-        if not field:
-            print("Error: --field required", file=sys.stderr)
-            sys.exit(1)
-        if not value:
-            print("Error: --value required", file=sys.stderr)
-            sys.exit(1)
-        if not reason:
-            print("Error: --reason required", file=sys.stderr)
-            sys.exit(1)
-        cmd_update(char_name, field, value, reason, session_name, output_json)
-    else:
+    positional = parse_options(sys.argv[2:], FLAGS, opts)
+    if positional:
+        opts["char_name"] = positional[-1]
+
+    handler = COMMANDS.get(command)
+    if handler is None:
         print(f"Unknown command: {command}", file=sys.stderr)
         sys.exit(1)
 
+    check_required(REQUIRED, command, opts)
+
+    # Load characters only once the command line is known to be usable
+    discover_characters(Path.cwd())
+    handler(opts)
+
 
 if __name__ == "__main__":
     main()
@@ -7,6 +7,11 @@ import sys
 from typing import List, Dict, Any
 
 
+# Modifier codes that keep or drop dice, and those that reroll them
+KEEP_DROP_MODIFIERS = frozenset({'kh', 'kl', 'dh', 'dl'})
+REROLL_MODIFIERS = frozenset({'r', 'rr'})
+
+
 class DiceRoll:
     """Class to represent and process a dice roll with Roll20-compatible notation."""
 
@@ -80,7 +85,7 @@ class DiceRoll:
             mod_value = int(match[3]) if match[3] else None
 
             # Validate keep/drop modifier value
-            if mod_type in ('kh', 'kl', 'dh', 'dl') and mod_value is not None and mod_value < 1:
+            if mod_type in KEEP_DROP_MODIFIERS and mod_value is not None and mod_value < 1:
                 raise ValueError(f"Cannot keep/drop fewer than 1 die")
 
             # Parse exploding dice
@@ -121,7 +126,7 @@ class DiceRoll:
                 rolls = [random.randint(1, sides) for _ in range(count)]
 
             # Process rerolls
-            if dice_set['mod_type'] in ('r', 'rr'):
+            if dice_set['mod_type'] in REROLL_MODIFIERS:
                 rolls = self._apply_rerolls(rolls, dice_set)
 
             # Process exploding dice
@@ -129,7 +134,7 @@ class DiceRoll:
                 rolls = self._apply_exploding(rolls, dice_set)
 
             # Process keep/drop modifiers
-            if dice_set['mod_type'] in ('kh', 'kl', 'dh', 'dl'):
+            if dice_set['mod_type'] in KEEP_DROP_MODIFIERS:
                 kept = self._apply_keep_drop(rolls, dice_set)
             else:
                 kept = rolls.copy()
@@ -322,7 +327,7 @@ class DiceRoll:
         for i, (dice_set, rolls, kept) in enumerate(zip(self.dice_sets, result['rolls'], result['kept'])):
             set_description = self._describe_dice_set(dice_set)
 
-            if dice_set['mod_type'] in ('kh', 'kl', 'dh', 'dl'):
+            if dice_set['mod_type'] in KEEP_DROP_MODIFIERS:
                 formatted += f"Set {i+1}: {set_description}\n"
                 formatted += f"  Rolled: {rolls}\n"
                 formatted += f"  Kept: {kept}\n"
@@ -361,16 +366,22 @@ class DiceRoll:
         return description
 
 
+HELP = """\
+Usage: python dice.py <notation>
+
+Examples:
+  python dice.py 2d6           # Basic roll
+  python dice.py 4d6kh3        # Keep highest 3
+  python dice.py 2d20+5        # With modifier
+  python dice.py 3d6!          # Exploding dice
+  python dice.py 5d10>7        # Count successes
+  python dice.py 4dF           # Fudge/Fate dice
+"""
+
+
 def main():
     if len(sys.argv) != 2 or sys.argv[1] in ('--help', '-h'):
-        print("Usage: python dice.py <notation>")
-        print("\nExamples:")
-        print("  python dice.py 2d6           # Basic roll")
-        print("  python dice.py 4d6kh3        # Keep highest 3")
-        print("  python dice.py 2d20+5        # With modifier")
-        print("  python dice.py 3d6!          # Exploding dice")
-        print("  python dice.py 5d10>7        # Count successes")
-        print("  python dice.py 4dF           # Fudge/Fate dice")
+        sys.stdout.write(HELP)
         sys.exit(0 if len(sys.argv) > 1 and sys.argv[1] in ('--help', '-h') else 1)
 
     notation = sys.argv[1]
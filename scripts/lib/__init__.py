@@ -1,10 +1,9 @@
 """Shared library for RPG tools."""
 
-from .parsers import parse_era, parse_session
+from .parsers import parse_era, parse_session, parse_json_value, parse_options, check_required
 from .discovery import discover_data
-from .lookup import find_item, find_items_by_field
-from .changelog import Changelog, ChangeEntry, load_changelog
-from .persistence import save_item, find_source_file, delete_item_file
+from .lookup import find_item, find_items_by_field, build_lookup_index
+from .persistence import save_item, find_source_file, remember_source_file, delete_item_file, write_json, write_item
 from .validation import (
     ValidationError,
     validate_positive_int,
@@ -19,18 +18,44 @@ from .validation import (
     VALID_INVOLVEMENTS,
 )
 
+# Names resolved on first access, so tools that never touch the changelog
+# skip importing it (and dataclasses) at startup
+_LAZY_NAMES = {
+    'Changelog': 'changelog',
+    'ChangeEntry': 'changelog',
+    'load_changelog': 'changelog',
+}
+
+
+def __getattr__(name):
+    module_name = _LAZY_NAMES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from importlib import import_module
+    value = getattr(import_module(f'.{module_name}', __name__), name)
+    globals()[name] = value
+    return value
+
+
 __all__ = [
     'parse_era',
     'parse_session',
+    'parse_json_value',
+    'parse_options',
+    'check_required',
     'discover_data',
     'find_item',
     'find_items_by_field',
+    'build_lookup_index',
     'Changelog',
     'ChangeEntry',
     'load_changelog',
     'save_item',
     'find_source_file',
+    'remember_source_file',
     'delete_item_file',
+    'write_json',
+    'write_item',
     'ValidationError',
     'validate_positive_int',
     'validate_id',
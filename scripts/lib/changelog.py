@@ -6,6 +6,8 @@ from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional, Any
 
+from .persistence import write_json
+
 
 @dataclass
 class ChangeEntry:
@@ -64,11 +66,10 @@ class Changelog:
             except (FileNotFoundError, json.JSONDecodeError):
                 self.entries = []
 
-    def _save(self) -> None:
+    def save(self) -> None:
         """Save changelog to disk."""
         self.path.parent.mkdir(exist_ok=True)
-        with open(self.path, 'w', encoding='utf-8') as f:
-            json.dump([e.to_dict() for e in self.entries], f, indent=2)
+        write_json(self.path, [e.to_dict() for e in self.entries])
 
     def _generate_id(self) -> str:
         """Generate next change ID."""
@@ -93,9 +94,13 @@ class Changelog:
         reason: str,
         branch: Optional[str] = None,
         timeline: Optional[str] = None,
-        linked_log: Optional[str] = None
+        linked_log: Optional[str] = None,
+        save: bool = True
     ) -> ChangeEntry:
-        """Add a new changelog entry."""
+        """Add a new changelog entry.
+
+        Pass save=False when adding several entries, then call save() once.
+        """
         entry = ChangeEntry(
             id=self._generate_id(),
             session=session,
@@ -110,7 +115,8 @@ class Changelog:
             linked_log=linked_log
         )
         self.entries.append(entry)
-        self._save()
+        if save:
+            self.save()
         return entry
 
     def get_for_character(self, character_id: str) -> List[ChangeEntry]:
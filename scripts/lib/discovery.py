@@ -3,7 +3,9 @@
 import json
 import sys
 from pathlib import Path
-from typing import Dict, Any, List, Optional, Callable
+from typing import Dict, Any, List, Optional, Callable, Set
+
+from .persistence import remember_source_file
 
 
 def discover_data(
@@ -93,6 +95,7 @@ def discover_data(
 
     # Track sources for duplicate detection
     item_sources: Dict[str, Path] = {}
+    duplicate_ids: Set[str] = set()
 
     # Load all discovered files
     for path in data_paths:
@@ -106,11 +109,19 @@ def discover_data(
                     if item_id in items:
                         on_warning(f"Warning: Duplicate ID '{item_id}' found in {path.name} "
                                   f"(already loaded from {item_sources[item_id].name})")
+                        duplicate_ids.add(item_id)
                     items[item_id] = item
                     item_sources[item_id] = path
         except Exception as e:
             on_warning(f"Warning: Could not load {data_type} file {path}: {e}")
 
+    # Remember files under {search_root}/{data_type}/ so saving an item back
+    # does not rescan the directory; duplicated IDs keep the scan's choice
+    own_dir = search_root / data_type
+    for item_id, path in item_sources.items():
+        if path.parent == own_dir and item_id not in duplicate_ids:
+            remember_source_file(data_type, item_id, search_root, path)
+
     if not items:
         on_warning(f"Warning: No {data_type} files found in {data_type}/")
 
@@ -10,7 +10,8 @@ def find_item(
     type_label: str = "Item",
     *,
     exit_on_missing: bool = True,
-    show_available: bool = True
+    show_available: bool = True,
+    index: Optional[Dict[str, Dict[str, Any]]] = None
 ) -> Optional[Dict[str, Any]]:
     """Find an item by ID or name (case-insensitive).
 
@@ -20,17 +21,29 @@ def find_item(
         type_label: Human-readable type name for error messages (e.g., "Character").
         exit_on_missing: If True, exits with error when not found. If False, returns None.
         show_available: If True, shows available items in error message.
+        index: Optional index from build_lookup_index(). Use when resolving many
+               names against the same items to avoid rescanning them each time.
 
     Returns:
         The matching item dict, or None if not found and exit_on_missing is False.
     """
+    # Exact ID is the common case; skip lowercasing and scanning entirely
+    item = items.get(name)
+    if item is not None and item.get("id") == name:
+        return item
+
     name_lower = name.lower()
 
-    for item in items.values():
-        if (item.get("id", "").lower() == name_lower or
-            item.get("name", "").lower() == name_lower or
-            item.get("title", "").lower() == name_lower):
+    if index is not None:
+        item = index.get(name_lower)
+        if item is not None:
             return item
+    else:
+        for item in items.values():
+            if (item.get("id", "").lower() == name_lower or
+                item.get("name", "").lower() == name_lower or
+                item.get("title", "").lower() == name_lower):
+                return item
 
     if exit_on_missing:
         print(f"Error: {type_label} '{name}' not found", file=sys.stderr)
@@ -43,6 +56,27 @@ def find_item(
     return None
 
 
+def build_lookup_index(items: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """Build a case-insensitive index of items by ID, name, and title.
+
+    Args:
+        items: Dictionary of items keyed by ID.
+
+    Returns:
+        Dict mapping lowercased IDs, names, and titles to items. If several items
+        share a key, the first one wins, matching find_item's scan order.
+    """
+    index: Dict[str, Dict[str, Any]] = {}
+
+    for item in items.values():
+        for field in ("id", "name", "title"):
+            value = item.get(field)
+            if value:
+                index.setdefault(value.lower(), item)
+
+    return index
+
+
 def find_items_by_field(
     items: Dict[str, Dict[str, Any]],
     field: str,
@@ -1,6 +1,9 @@
 """Parsing utilities for era strings, session numbers, etc."""
 
+import json
 import re
+import sys
+from typing import Any, Dict, List, Tuple
 
 
 def parse_era(era_str: str) -> int:
@@ -42,3 +45,81 @@ def parse_session(session_str: str) -> int:
     if match:
         return int(match.group(1))
     return 0
+
+
+def parse_json_value(value: str) -> Any:
+    """Parse a CLI field value that may hold a JSON object or array.
+
+    Values starting with '{' or '[' are decoded; anything else is returned
+    unchanged as a string.
+
+    Raises:
+        ValueError: If the value looks like JSON but cannot be decoded.
+    """
+    if value[:1] in ('{', '['):
+        return json.loads(value)
+    return value
+
+
+def parse_options(
+    args: List[str],
+    flags: Dict[str, Tuple[str, bool]],
+    opts: Dict[str, Any]
+) -> List[str]:
+    """Split command-line arguments into flag options and positionals.
+
+    Flags listed in the table are stored in opts under their key: flags that
+    take a value consume the next argument, the rest are set to True. Exits
+    with an error on an unknown --option or a value flag missing its value.
+
+    Args:
+        args: Arguments to parse (without the script and command names).
+        flags: Table mapping each flag to (option key, takes a value).
+        opts: Option defaults, updated in place.
+
+    Returns:
+        The positional arguments, in order.
+    """
+    positionals = []
+    argc = len(args)
+    i = 0
+    while i < argc:
+        arg = args[i]
+        spec = flags.get(arg)
+        if spec is not None:
+            key, takes_value = spec
+            if not takes_value:
+                opts[key] = True
+                i += 1
+                continue
+            if i + 1 < argc:
+                opts[key] = args[i + 1]
+                i += 2
+                continue
+        elif not arg.startswith("--"):
+            positionals.append(arg)
+            i += 1
+            continue
+        print(f"Unknown option: {arg}", file=sys.stderr)
+        sys.exit(1)
+
+    return positionals
+
+
+def check_required(
+    required: Dict[str, Tuple[Tuple[str, str], ...]],
+    command: str,
+    opts: Dict[str, Any]
+) -> None:
+    """Exit with an error if an option the command requires is missing.
+
+    Args:
+        required: Table mapping each command to its (option key, error message)
+                  checks, run in order; the first empty option is reported.
+        command: The command being run.
+        opts: Parsed options.
+    """
+    for key, message in required.get(command, ()):
+        if not opts[key]:
+            print(f"Error: {message}", file=sys.stderr)
+            sys.exit(1)
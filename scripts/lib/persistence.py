@@ -1,8 +1,51 @@
 """Persistence utilities for saving and deleting campaign data items."""
 
 import json
+import os
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
+
+
+# Resolved source files, keyed by (data_type, item_id, search_root)
+_source_file_cache: Dict[Tuple[str, str, Path], Path] = {}
+
+
+def write_json(path: Path, data: Any) -> None:
+    """Serialize data and write it to path in a single call.
+
+    The data is written to a sibling temp file first and then moved over
+    path, so an interrupted save never leaves a truncated file behind.
+
+    Args:
+        path: The file to write.
+        data: JSON-serializable data.
+    """
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.write_text(json.dumps(data, indent=2), encoding='utf-8')
+    os.replace(tmp_path, path)
+
+
+def write_item(path: Path, item: Dict[str, Any]) -> None:
+    """Write an item back to its source file.
+
+    Source files may hold a single item or a list of items. For a list, only
+    the entry with the item's ID is replaced and the other items are kept.
+
+    Args:
+        path: The item's source file (e.g., from find_source_file).
+        item: The item dict to write (must have "id" field).
+    """
+    try:
+        existing = json.loads(path.read_text(encoding='utf-8-sig'))
+    except (OSError, json.JSONDecodeError):
+        existing = None
+
+    if isinstance(existing, list):
+        item_id = item.get("id")
+        write_json(path, [item if isinstance(entry, dict) and entry.get("id") == item_id else entry
+                          for entry in existing])
+    else:
+        write_json(path, item)
 
 
 def save_item(data_type: str, item: Dict[str, Any], search_root: Path) -> Path:
@@ -24,12 +67,29 @@ def save_item(data_type: str, item: Dict[str, Any], search_root: Path) -> Path:
     data_dir.mkdir(exist_ok=True)
 
     path = data_dir / f"{item_id}.json"
-    with open(path, 'w', encoding='utf-8') as f:
-        json.dump(item, f, indent=2)
+    write_json(path, item)
 
+    _source_file_cache[(data_type, item_id, search_root)] = path
     return path
 
 
+def remember_source_file(
+    data_type: str,
+    item_id: str,
+    search_root: Path,
+    path: Path
+) -> None:
+    """Record where an item was loaded from so find_source_file can skip its scan.
+
+    Args:
+        data_type: The type of data (e.g., "characters", "locations").
+        item_id: The item ID.
+        search_root: The root directory later passed to find_source_file.
+        path: The file the item was loaded from.
+    """
+    _source_file_cache[(data_type, item_id, search_root)] = path
+
+
 def find_source_file(
     data_type: str,
     item_id: str,
@@ -37,7 +97,8 @@ def find_source_file(
 ) -> Optional[Path]:
     """Locate the source file for an item.
 
-    Tries canonical path first, then scans directory.
+    Tries canonical path first, then scans directory. Resolved paths are
+    cached for the rest of the process, so repeated lookups skip the scan.
 
     Args:
         data_type: The type of data (e.g., "characters", "locations").
@@ -47,11 +108,17 @@ def find_source_file(
     Returns:
         Path to the file, or None if not found.
     """
+    key = (data_type, item_id, search_root)
+    cached = _source_file_cache.get(key)
+    if cached is not None and cached.exists():
+        return cached
+
     data_dir = search_root / data_type
 
     # Try canonical path first
     canonical = data_dir / f"{item_id}.json"
     if canonical.exists():
+        _source_file_cache[key] = canonical
         return canonical
 
     # Scan directory for file containing this ID
@@ -62,11 +129,13 @@ def find_source_file(
                     data = json.load(f)
                     # Handle single item
                     if isinstance(data, dict) and data.get("id") == item_id:
+                        _source_file_cache[key] = path
                         return path
                     # Handle array of items
                     if isinstance(data, list):
                         for item in data:
                             if item.get("id") == item_id:
+                                _source_file_cache[key] = path
                                 return path
             except (OSError, json.JSONDecodeError):
                 pass
@@ -92,5 +161,6 @@ def delete_item_file(
     path = find_source_file(data_type, item_id, search_root)
     if path:
         path.unlink()
+        _source_file_cache.pop((data_type, item_id, search_root), None)
         return True
     return False
@@ -1,25 +1,58 @@
 #!/usr/bin/env python3
 """Location tool for solo RPG games. Provides hierarchical/graph location data loading."""
 
-import subprocess
 import sys
 from pathlib import Path
-from typing import Dict, List, Optional, Set
+from typing import Any, Dict, List, Optional, Set
 
 import json
 
-from lib import discover_data, find_item, save_item, find_source_file, delete_item_file
+from lib import discover_data, find_item, parse_json_value, parse_options, check_required, save_item, find_source_file, delete_item_file, write_item
 
 
 # Location storage
 locations: Dict[str, Dict] = {}
 
+# Child locations by parent ID (primary or additional), in discovery order
+children_index: Dict[str, List[Dict]] = {}
+
+# Fields of "full" that format_full renders under their own headings, in order;
+# bulleted fields hold lists shown one item per line
+FULL_SECTIONS = (
+    ("description", "Description", False),
+    ("atmosphere", "Atmosphere", False),
+    ("history", "History", False),
+    ("notable_features", "Notable Features", True),
+    ("dangers", "Dangers", False),
+    ("secrets", "Secrets", False),
+)
+
+# Fields of "full" that format_full renders with their own headings
+FULL_FIELDS = frozenset(key for key, _, _ in FULL_SECTIONS)
+
 
 def discover_locations(search_root: Path) -> None:
     """Discover location files from locations/ folder."""
-    global locations
+    global locations, children_index
     locations = discover_data("locations", search_root)
 
+    children_index = {}
+    for loc in locations.values():
+        for parent_id in get_all_parents(loc):
+            children_index.setdefault(parent_id, []).append(loc)
+
+
+def get_location_name(loc_id: str) -> str:
+    """Get display name for a location ID, falling back to the ID itself."""
+    loc = locations.get(loc_id)
+    return loc.get("name", loc_id) if loc else loc_id
+
+
+def get_location_type(loc: Dict) -> str:
+    """Get a location's minimal type, or an empty string if unset."""
+    minimal = loc.get("minimal")
+    return (minimal.get("type") or "") if minimal else ""
+
 
 def get_all_parents(loc: Dict) -> List[str]:
     """Get all parent IDs for a location (primary + additional)."""
@@ -33,13 +66,7 @@ def get_all_parents(loc: Dict) -> List[str]:
 
 def get_children(loc_id: str) -> List[Dict]:
     """Get all locations that have loc_id as a parent."""
-    children = []
-    for loc in locations.values():
-        if loc.get("parent") == loc_id:
-            children.append(loc)
-        elif loc_id in loc.get("parents", []):
-            children.append(loc)
-    return children
+    return children_index.get(loc_id, [])
 
 
 def get_root_locations() -> List[Dict]:
@@ -61,18 +88,18 @@ def filter_locations(
             print("Error: --tag cannot be empty", file=sys.stderr)
             sys.exit(1)
         tag_lower = tag.lower()
-        result = [loc for loc in result if tag_lower in [t.lower() for t in loc.get("tags", [])]]
+        result = [loc for loc in result if any(t.lower() == tag_lower for t in loc.get("tags", []))]
 
     if parent:
         parent_lower = parent.lower()
         result = [loc for loc in result
                   if (loc.get("parent", "").lower() == parent_lower or
-                      parent_lower in [p.lower() for p in loc.get("parents", [])])]
+                      any(p.lower() == parent_lower for p in loc.get("parents") or ()))]
 
     if loc_type:
         type_lower = loc_type.lower()
         result = [loc for loc in result
-                  if loc.get("minimal", {}).get("type", "").lower() == type_lower]
+                  if get_location_type(loc).lower() == type_lower]
 
     return result
 
@@ -92,12 +119,7 @@ def format_minimal(loc: Dict) -> str:
     # Show parent(s)
     parents = get_all_parents(loc)
     if parents:
-        parent_names = []
-        for pid in parents:
-            if pid in locations:
-                parent_names.append(locations[pid].get("name", pid))
-            else:
-                parent_names.append(pid)
+        parent_names = [get_location_name(pid) for pid in parents]
         lines.append(f"**Within:** {', '.join(parent_names)}")
 
     # Show what's available
@@ -120,31 +142,19 @@ def format_full(loc: Dict) -> str:
 
     full = loc.get("full", {})
 
-    if full.get("description"):
-        lines.append(f"\n## Description\n{full['description']}")
-
-    if full.get("atmosphere"):
-        lines.append(f"\n## Atmosphere\n{full['atmosphere']}")
-
-    if full.get("history"):
-        lines.append(f"\n## History\n{full['history']}")
-
-    if full.get("notable_features"):
-        lines.append("\n## Notable Features")
-        for feature in full["notable_features"]:
-            lines.append(f"- {feature}")
-
-    if full.get("dangers"):
-        lines.append(f"\n## Dangers\n{full['dangers']}")
-
-    if full.get("secrets"):
-        lines.append(f"\n## Secrets\n{full['secrets']}")
+    for key, title, bulleted in FULL_SECTIONS:
+        value = full.get(key)
+        if not value:
+            continue
+        if bulleted:
+            lines.append(f"\n## {title}")
+            lines.extend(f"- {item}" for item in value)
+        else:
+            lines.append(f"\n## {title}\n{value}")
 
     # Handle any additional fields in full
-    known_fields = {"description", "atmosphere", "history", "notable_features", "dangers", "secrets"}
-    for key, value in full.items():
-        if key not in known_fields:
-            lines.append(f"\n## {key.replace('_', ' ').title()}\n{value}")
+    lines.extend(f"\n## {key.replace('_', ' ').title()}\n{value}"
+                 for key, value in full.items() if key not in FULL_FIELDS)
 
     return "\n".join(lines)
 
@@ -189,7 +199,7 @@ def build_tree(loc_id: Optional[str] = None, indent: int = 0, visited: Optional[
         roots = get_root_locations()
         roots.sort(key=lambda x: (x.get("name") or x.get("id") or ""))
         for root in roots:
-            lines.extend(build_tree(root.get("id"), indent, visited.copy()))
+            lines.extend(build_tree(root.get("id"), indent, visited))
 
         # Find orphaned locations (have parent, but parent doesn't exist)
         orphans = []
@@ -202,38 +212,47 @@ def build_tree(loc_id: Optional[str] = None, indent: int = 0, visited: Optional[
             orphans.sort(key=lambda x: (x.get("name") or x.get("id") or ""))
             for orphan in orphans:
                 name = orphan.get("name", orphan.get("id", "Unknown"))
-                loc_type = orphan.get("minimal", {}).get("type", "")
+                loc_type = get_location_type(orphan)
                 type_str = f" ({loc_type})" if loc_type else ""
                 parent_id = orphan.get("parent")
                 lines.append(f"{name}{type_str} [!parent '{parent_id}' not found]")
                 # Also show children of orphans
-                lines.extend(build_tree(orphan.get("id"), 1, visited.copy()))
+                lines.extend(build_tree(orphan.get("id"), 1, visited))
     else:
-        if loc_id in visited:
-            # Circular reference detected
-            loc = locations.get(loc_id)
-            name = loc.get("name", loc_id) if loc else loc_id
-            print(f"Warning: Circular parent reference detected for '{name}'", file=sys.stderr)
-            return lines
-        visited.add(loc_id)
-
-        loc = locations.get(loc_id)
-        if not loc:
-            return lines
-
-        name = loc.get("name", loc_id)
-        loc_type = loc.get("minimal", {}).get("type", "")
-        type_str = f" ({loc_type})" if loc_type else ""
+        # Depth-first walk with an explicit stack. A node's exit marker sits
+        # below its children, so visited holds only the current path.
+        stack = [(loc_id, indent, False)]
+        while stack:
+            current_id, depth, leaving = stack.pop()
+            if leaving:
+                visited.discard(current_id)
+                continue
+
+            if current_id in visited:
+                # Circular reference detected
+                loc = locations.get(current_id)
+                name = loc.get("name", current_id) if loc else current_id
+                print(f"Warning: Circular parent reference detected for '{name}'", file=sys.stderr)
+                continue
+
+            loc = locations.get(current_id)
+            if not loc:
+                continue
+
+            name = loc.get("name", current_id)
+            loc_type = get_location_type(loc)
+            type_str = f" ({loc_type})" if loc_type else ""
 
-        prefix = "  " * indent + ("+- " if indent > 0 else "")
-        lines.append(f"{prefix}{name}{type_str}")
+            prefix = "  " * depth + ("+- " if depth > 0 else "")
+            lines.append(f"{prefix}{name}{type_str}")
 
-        # Get children (using primary parent only for tree view)
-        children = [c for c in locations.values() if c.get("parent") == loc_id]
-        children.sort(key=lambda x: (x.get("name") or x.get("id") or ""))
+            # Get children (using primary parent only for tree view)
+            children = [c for c in get_children(current_id) if c.get("parent") == current_id]
+            children.sort(key=lambda x: (x.get("name") or x.get("id") or ""))
 
-        for child in children:
-            lines.extend(build_tree(child.get("id"), indent + 1, visited.copy()))
+            visited.add(current_id)
+            stack.append((current_id, depth, True))
+            stack.extend((child.get("id"), depth + 1, False) for child in reversed(children))
 
     return lines
 
@@ -272,8 +291,9 @@ def get_connections(loc_id: str) -> Dict[str, str]:
     for other_id, other_loc in locations.items():
         if other_id == loc_id:
             continue
-        other_conns = other_loc.get("sections", {}).get("connections", {})
-        if loc_id in other_conns:
+        other_sections = other_loc.get("sections")
+        other_conns = other_sections.get("connections") if other_sections else None
+        if other_conns and loc_id in other_conns:
             if other_id not in connections:
                 connections[other_id] = f"(from {other_loc.get('name', other_id)}) {other_conns[loc_id]}"
 
@@ -297,18 +317,18 @@ def cmd_list(
     filtered.sort(key=lambda x: (x.get("name") or x.get("id") or ""))
 
     if short:
-        for loc in filtered:
-            print(format_minimal(loc))
-            print()
+        # Each minimal profile is followed by a blank line
+        sys.stdout.write("".join(f"{format_minimal(loc)}\n\n" for loc in filtered))
     else:
-        print("Locations:")
+        lines = ["Locations:"]
         for loc in filtered:
             name = loc.get("name", loc.get("id", "Unknown"))
-            loc_type = loc.get("minimal", {}).get("type", "")
+            loc_type = get_location_type(loc)
             tags = loc.get("tags", [])
             type_str = f" ({loc_type})" if loc_type else ""
             tag_str = f" [{', '.join(tags)}]" if tags else ""
-            print(f"  - {name}{type_str}{tag_str}")
+            lines.append(f"  - {name}{type_str}{tag_str}")
+        print("\n".join(lines))
 
         print(f"\nTotal: {len(filtered)} locations")
         print("Use --short for minimal profiles, or 'get <name>' for details")
@@ -357,34 +377,29 @@ def cmd_connections(loc_name: str) -> None:
     loc_id = loc.get("id")
     name = loc.get("name", loc_id)
     connections = get_connections(loc_id)
+    parents = get_all_parents(loc)
+    children = get_children(loc_id)
 
-    print(f"# Connections for {name}")
+    lines = [f"# Connections for {name}"]
 
-    # Parents
-    parents = get_all_parents(loc)
     if parents:
-        print("\n**Within:**")
-        for pid in parents:
-            pname = locations.get(pid, {}).get("name", pid)
-            print(f"  - {pname}")
+        lines.append("\n**Within:**")
+        lines.extend([f"  - {get_location_name(pid)}" for pid in parents])
 
-    # Children
-    children = get_children(loc_id)
     if children:
-        print("\n**Contains:**")
-        for child in children:
-            cname = child.get("name", child.get("id", "Unknown"))
-            print(f"  - {cname}")
+        lines.append("\n**Contains:**")
+        lines.extend([f"  - {child.get('name', child.get('id', 'Unknown'))}" for child in children])
 
     # Lateral connections
     if connections:
-        print("\n**Connected to:**")
-        for conn_id, desc in connections.items():
-            conn_name = locations.get(conn_id, {}).get("name", conn_id)
-            print(f"  - {conn_name}: {desc}")
+        lines.append("\n**Connected to:**")
+        lines.extend([f"  - {get_location_name(conn_id)}: {desc}"
+                      for conn_id, desc in connections.items()])
 
     if not parents and not children and not connections:
-        print("\nNo connections found")
+        lines.append("\nNo connections found")
+
+    print("\n".join(lines))
 
 
 def cmd_sections(loc_name: str) -> None:
@@ -407,6 +422,8 @@ def cmd_memories(loc_name: str) -> None:
     # Find location to validate name exists
     find_item(locations, loc_name, "Location")
 
+    import subprocess
+
     # Call memories.py to show memories for this location
     script_dir = Path(__file__).parent
     memories_script = script_dir / "memories.py"
@@ -492,12 +509,25 @@ def cmd_update(
     old_value = target.get(final_key)
 
     # Try to parse value as JSON (for arrays/objects)
-    parsed_value = value
-    if value.startswith('{') or value.startswith('['):
-        try:
-            parsed_value = json.loads(value)
-        except json.JSONDecodeError:
-            print(f"Warning: Value for --field {field} could not be parsed as JSON. Treating as string.", file=sys.stderr)
+    try:
+        parsed_value = parse_json_value(value)
+    except ValueError:
+        parsed_value = value
+        print(f"Warning: Value for --field {field} could not be parsed as JSON. Treating as string.", file=sys.stderr)
+
+    if parsed_value == old_value:
+        if output_json:
+            print(json.dumps({
+                "id": loc_id,
+                "field": field,
+                "old_value": old_value,
+                "new_value": parsed_value,
+                "noop": True
+            }, indent=2))
+        else:
+            name = loc.get("name", loc_id)
+            print(f"No change for {name}.{field}")
+        return
 
     # Update the value
     target[final_key] = parsed_value
@@ -505,8 +535,7 @@ def cmd_update(
     # Find the location file and save
     loc_file = find_source_file("locations", loc_id, search_root)
     if loc_file:
-        with open(loc_file, 'w', encoding='utf-8') as f:
-            json.dump(loc, f, indent=2)
+        write_item(loc_file, loc)
 
     if output_json:
         print(json.dumps({
@@ -537,182 +566,207 @@ def cmd_delete(loc_id: str) -> None:
         sys.exit(1)
 
 
-def main():
-    search_root = Path.cwd()
-    discover_locations(search_root)
+REQUIRED = {
+    "create": (
+        ("loc_name", "location id required for create"),
+        ("name", "--name required for create"),
+        ("loc_type", "--type required for create"),
+        ("essence", "--essence required for create"),
+    ),
+    "update": (
+        ("loc_name", "location id required for update"),
+        ("field", "--field required for update"),
+        ("value", "--value required for update"),
+    ),
+    "delete": (
+        ("loc_name", "location id required for delete"),
+    ),
+    "get": (
+        ("loc_name", "location name required for 'get'"),
+    ),
+    "path": (
+        ("loc_name", "location name required for 'path'"),
+    ),
+    "connections": (
+        ("loc_name", "location name required for 'connections'"),
+    ),
+    "sections": (
+        ("loc_name", "location name required for 'sections'"),
+    ),
+    "memories": (
+        ("loc_name", "location name required for 'memories'"),
+    ),
+}
+
+
+def run_create(opts: Dict[str, Any]) -> None:
+    """Run the create command from parsed options."""
+    cmd_create(
+        loc_id=opts["loc_name"],
+        name=opts["name"],
+        loc_type=opts["loc_type"],
+        essence=opts["essence"],
+        parent=opts["parent"],
+        tags=opts["tags"],
+        output_json=opts["output_json"]
+    )
+
+
+def run_update(opts: Dict[str, Any]) -> None:
+    """Run the update command from parsed options."""
+    cmd_update(opts["loc_name"], opts["field"], opts["value"], opts["output_json"])
+
+
+def run_delete(opts: Dict[str, Any]) -> None:
+    """Run the delete command from parsed options."""
+    cmd_delete(opts["loc_name"])
+
+
+def run_list(opts: Dict[str, Any]) -> None:
+    """Run the list command from parsed options."""
+    cmd_list(opts["tag"], opts["parent"], opts["loc_type"], opts["short"])
+
+
+def run_get(opts: Dict[str, Any]) -> None:
+    """Run the get command from parsed options."""
+    cmd_get(opts["loc_name"], opts["depth"], opts["section"])
+
+
+def run_tree(opts: Dict[str, Any]) -> None:
+    """Run the tree command from parsed options."""
+    cmd_tree(opts["loc_name"])
+
+
+def run_path(opts: Dict[str, Any]) -> None:
+    """Run the path command from parsed options."""
+    cmd_path(opts["loc_name"])
+
+
+def run_connections(opts: Dict[str, Any]) -> None:
+    """Run the connections command from parsed options."""
+    cmd_connections(opts["loc_name"])
+
+
+def run_sections(opts: Dict[str, Any]) -> None:
+    """Run the sections command from parsed options."""
+    cmd_sections(opts["loc_name"])
+
+
+def run_memories(opts: Dict[str, Any]) -> None:
+    """Run the memories command from parsed options."""
+    cmd_memories(opts["loc_name"])
+
+
+COMMANDS = {
+    "create": run_create,
+    "update": run_update,
+    "delete": run_delete,
+    "list": run_list,
+    "get": run_get,
+    "tree": run_tree,
+    "path": run_path,
+    "connections": run_connections,
+    "sections": run_sections,
+    "memories": run_memories,
+}
+
+
+FLAGS = {
+    "--tag": ("tag", True),
+    "--parent": ("parent", True),
+    "--type": ("loc_type", True),
+    "--short": ("short", False),
+    "--depth": ("depth", True),
+    "--section": ("section", True),
+    "--name": ("name", True),
+    "--essence": ("essence", True),
+    "--tags": ("tags", True),
+    "--field": ("field", True),
+    "--value": ("value", True),
+    "--json": ("output_json", False),
+}
+
+HELP = """\
+Usage: python locations.py <command> [options]
+
+Commands:
+  create <id> --name N --type T --essence E ...
+                                 Create a new location
+  update <id> --field F --value V
+                                 Update a location field
+  delete <id>                    Delete a location
+  list [filters...]              List location names
+  list --short [filters...]      List with minimal profiles
+  get <name>                     Get minimal profile
+  get <name> --depth full        Get full profile
+  get <name> --section NAME      Get specific section
+  sections <name>                List available sections
+  tree                           Show full hierarchy
+  tree <name>                    Show subtree from location
+  path <name>                    Show path from root
+  connections <name>             Show all connections
+  memories <name>                Show memories at location
+
+Create options:
+  --name NAME                    Location display name (required)
+  --type TYPE                    Location type (required)
+  --essence TEXT                 Location essence (required)
+  --parent ID                    Parent location ID
+  --tags TAGS                    Comma-separated tags
+  --json                         Output as JSON
+
+Update options:
+  --field FIELD                  Field to update (dot notation)
+  --value VALUE                  New value
+  --json                         Output as JSON
+
+Filters (for list):
+  --tag NAME                     Filter by tag
+  --parent NAME                  Filter by parent
+  --type NAME                    Filter by type
+"""
 
+
+def main():
     if len(sys.argv) < 2 or sys.argv[1] in ('--help', '-h'):
-        print("Usage: python locations.py <command> [options]")
-        print("\nCommands:")
-        print("  create <id> --name N --type T --essence E ...")
-        print("                                 Create a new location")
-        print("  update <id> --field F --value V")
-        print("                                 Update a location field")
-        print("  delete <id>                    Delete a location")
-        print("  list [filters...]              List location names")
-        print("  list --short [filters...]      List with minimal profiles")
-        print("  get <name>                     Get minimal profile")
-        print("  get <name> --depth full        Get full profile")
-        print("  get <name> --section NAME      Get specific section")
-        print("  sections <name>                List available sections")
-        print("  tree                           Show full hierarchy")
-        print("  tree <name>                    Show subtree from location")
-        print("  path <name>                    Show path from root")
-        print("  connections <name>             Show all connections")
-        print("  memories <name>                Show memories at location")
-        print("\nCreate options:")
-        print("  --name NAME                    Location display name (required)")
-        print("  --type TYPE                    Location type (required)")
-        print("  --essence TEXT                 Location essence (required)")
-        print("  --parent ID                    Parent location ID")
-        print("  --tags TAGS                    Comma-separated tags")
-        print("  --json                         Output as JSON")
-        print("\nUpdate options:")
-        print("  --field FIELD                  Field to update (dot notation)")
-        print("  --value VALUE                  New value")
-        print("  --json                         Output as JSON")
-        print("\nFilters (for list):")
-        print("  --tag NAME                     Filter by tag")
-        print("  --parent NAME                  Filter by parent")
-        print("  --type NAME                    Filter by type")
+        sys.stdout.write(HELP)
         sys.exit(0 if len(sys.argv) > 1 and sys.argv[1] in ('--help', '-h') else 1)
 
     command = sys.argv[1]
 
     # Parse options
-    tag = None
-    parent = None
-    loc_type = None
-    short = False
-    depth = "minimal"
-    section = None
-    loc_name = None
-    # Create/update-specific options
-    name = None
-    essence = None
-    tags_list = None
-    field = None
-    value = None
-    output_json = False
-
-    i = 2
-    while i < len(sys.argv):
-        arg = sys.argv[i]
-        if arg == "--tag" and i + 1 < len(sys.argv):
-            tag = sys.argv[i + 1]
-            i += 2
-        elif arg == "--parent" and i + 1 < len(sys.argv):
-            parent = sys.argv[i + 1]
-            i += 2
-        elif arg == "--type" and i + 1 < len(sys.argv):
-            loc_type = sys.argv[i + 1]
-            i += 2
-        elif arg == "--short":
-            short = True
-            i += 1
-        elif arg == "--depth" and i + 1 < len(sys.argv):
-            depth = sys.argv[i + 1]
-            i += 2
-        elif arg == "--section" and i + 1 < len(sys.argv):
-            section = sys.argv[i + 1]
-            i += 2
-        elif arg == "--name" and i + 1 < len(sys.argv):
-            name = sys.argv[i + 1]
-            i += 2
-        elif arg == "--essence" and i + 1 < len(sys.argv):
-            essence = sys.argv[i + 1]
-            i += 2
-        elif arg == "--tags" and i + 1 < len(sys.argv):
-            tags_list = sys.argv[i + 1]
-            i += 2
-        elif arg == "--field" and i + 1 < len(sys.argv):
-            field = sys.argv[i + 1]
-            i += 2
-        elif arg == "--value" and i + 1 < len(sys.argv):
-            value = sys.argv[i + 1]
-            i += 2
-        elif arg == "--json":
-            output_json = True
-            i += 1
-        elif not arg.startswith("--"):
-            loc_name = arg
-            i += 1
-        else:
-            print(f"Unknown option: {arg}", file=sys.stderr)
-            sys.exit(1)
+    opts = {
+        "loc_name": None,
+        "tag": None,
+        "parent": None,
+        "loc_type": None,
+        "short": False,
+        "depth": "minimal",
+        "section": None,
+        # Create/update-specific options
+        "name": None,
+        "essence": None,
+        "tags": None,
+        "field": None,
+        "value": None,
+        "output_json": False,
+    }
 
-    # Execute command
-    if command == "create":
-        if not loc_name:
-            print("Error: location id required for create", file=sys.stderr)
-            sys.exit(1)
-        if not name:
-            print("Error: --name required for create", file=sys.stderr)
-            sys.exit(1)
-        if not loc_type:
-            print("Error: --type required for create", file=sys.stderr)
-            sys.exit(1)
-        if not essence:
-            print("Error: --essence required for create", file=sys.stderr)
-            sys.exit(1)
-        cmd_create(
-            loc_id=loc_name,
-            name=name,
-            loc_type=loc_type,
-            essence=essence,
-            parent=parent,
-            tags=tags_list,
-            output_json=output_json
-        )
-    elif command == "update":
-        if not loc_name:
-            print("Error: location id required for update", file=sys.stderr)
-            sys.exit(1)
-        if not field:
-            print("Error: --field required for update", file=sys.stderr)
-            sys.exit(1)
-        if not value:
-            print("Error: --value required for update", file=sys.stderr)
-            sys.exit(1)
-        cmd_update(loc_name, field, value, output_json)
-    elif command == "delete":
-        if not loc_name:
-            print("Error: location id required for delete", file=sys.stderr)
-            sys.exit(1)
-        cmd_delete(loc_name)
-    elif command == "list":
-        cmd_list(tag, parent, loc_type, short)
-    elif command == "get":
-        if not loc_name:
-            print("Error: location name required for 'get'", file=sys.stderr)
-            sys.exit(1)
-        cmd_get(loc_name, depth, section)
-    elif command == "tree":
-        cmd_tree(loc_name)
-    elif command == "path":
-        if not loc_name:
-            print("Error: location name required for 'path'", file=sys.stderr)
-            sys.exit(1)
-        cmd_path(loc_name)
-    elif command == "connections":
-        if not loc_name:
-            print("Error: location name required for 'connections'", file=sys.stderr)
-            sys.exit(1)
-        cmd_connections(loc_name)
-    elif command == "sections":
-        if not loc_name:
-            print("Error: location name required for 'sections'", file=sys.stderr)
-            sys.exit(1)
-        cmd_sections(loc_name)
-    elif command == "memories":
-        if not loc_name:
-            print("Error: location name required for 'memories'", file=sys.stderr)
-            sys.exit(1)
-        cmd_memories(loc_name)
-    else:
+    positional = parse_options(sys.argv[2:], FLAGS, opts)
+    if positional:
+        opts["loc_name"] = positional[-1]
+
+    handler = COMMANDS.get(command)
+    if handler is None:
         print(f"Unknown command: {command}", file=sys.stderr)
         sys.exit(1)
 
+    check_required(REQUIRED, command, opts)
+
+    # Load locations only once the command line is known to be usable
+    discover_locations(Path.cwd())
+    handler(opts)
+
 
 if __name__ == "__main__":
     main()
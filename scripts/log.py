@@ -7,6 +7,7 @@ from pathlib import Path
 from typing import Dict, List, Optional, Any
 from datetime import datetime
 
+from lib import write_json
 from lib.calendars import create_calendar, is_loose_date
 
 
@@ -65,8 +66,7 @@ def save_log(search_root: Path, entries: List[Dict[str, Any]]) -> None:
     log_dir.mkdir(exist_ok=True)
 
     log_path = log_dir / "log.json"
-    with open(log_path, 'w', encoding='utf-8') as f:
-        json.dump(entries, f, indent=2)
+    write_json(log_path, entries)
 
 
 def generate_log_id(entries: List[Dict[str, Any]]) -> str:
@@ -239,12 +239,12 @@ def cmd_list(
     if character:
         char_lower = character.lower()
         filtered = [e for e in filtered
-                   if char_lower in [c.lower() for c in e.get("characters", {}).keys()]]
+                   if any(c.lower() == char_lower for c in e.get("characters", {}))]
 
     if location:
         loc_lower = location.lower()
         filtered = [e for e in filtered
-                   if loc_lower in [l.lower() for l in e.get("locations", [])]]
+                   if any(l.lower() == loc_lower for l in e.get("locations", []))]
 
     if importance:
         imp_lower = importance.lower()
@@ -265,7 +265,7 @@ def cmd_list(
             sys.exit(1)
         tag_lower = tag.lower()
         filtered = [e for e in filtered
-                   if tag_lower in [t.lower() for t in e.get("tags", [])]]
+                   if any(t.lower() == tag_lower for t in e.get("tags", []))]
 
     if session:
         session_lower = session.lower()
@@ -322,33 +322,37 @@ def cmd_list(
                 print()
 
 
+def find_entry_index(entry_id: str) -> Optional[int]:
+    """Get the position of a log entry by ID, or None if not found."""
+    return next((i for i, entry in enumerate(log_entries) if entry.get("id") == entry_id), None)
+
+
 def cmd_show(entry_id: str, output_json: bool = False) -> None:
     """Show a specific log entry."""
-    for entry in log_entries:
-        if entry.get("id") == entry_id:
-            if output_json:
-                print(json.dumps(entry, indent=2))
-            else:
-                print(format_entry(entry, verbose=True))
-            return
+    i = find_entry_index(entry_id)
+    if i is None:
+        print(f"Error: Log entry '{entry_id}' not found", file=sys.stderr)
+        sys.exit(1)
 
-    print(f"Error: Log entry '{entry_id}' not found", file=sys.stderr)
-    sys.exit(1)
+    entry = log_entries[i]
+    if output_json:
+        print(json.dumps(entry, indent=2))
+    else:
+        print(format_entry(entry, verbose=True))
 
 
 def cmd_delete(entry_id: str) -> None:
     """Delete a log entry."""
     global log_entries
 
-    for i, entry in enumerate(log_entries):
-        if entry.get("id") == entry_id:
-            deleted = log_entries.pop(i)
-            save_log(Path.cwd(), log_entries)
-            print(f"Deleted: {format_entry(deleted)}")
-            return
+    i = find_entry_index(entry_id)
+    if i is None:
+        print(f"Error: Log entry '{entry_id}' not found", file=sys.stderr)
+        sys.exit(1)
 
-    print(f"Error: Log entry '{entry_id}' not found", file=sys.stderr)
-    sys.exit(1)
+    deleted = log_entries.pop(i)
+    save_log(Path.cwd(), log_entries)
+    print(f"Deleted: {format_entry(deleted)}")
 
 
 def get_digest_defaults() -> Dict[str, int]:
@@ -422,7 +426,7 @@ def cmd_digest(
     if character:
         char_lower = character.lower()
         all_entries = [e for e in all_entries
-                      if char_lower in [c.lower() for c in e.get("characters", {}).keys()]]
+                      if any(c.lower() == char_lower for c in e.get("characters", {}))]
 
     if not all_entries:
         print("No log entries found")
@@ -493,52 +497,75 @@ def cmd_digest(
         print("No significant entries found for digest")
 
 
+def int_option(opts: Dict[str, Any], key: str, flag: str) -> Optional[int]:
+    """Convert a raw integer option, exiting with an error if it is not a number."""
+    raw = opts[key]
+    if raw is None:
+        return None
+    try:
+        return int(raw)
+    except ValueError:
+        print(f"Error: {flag} requires an integer value", file=sys.stderr)
+        sys.exit(1)
+
+
+HELP = """\
+Usage: python log.py <command> [options]
+
+Commands:
+  add <summary> [options]        Add a log entry
+  list [filters...]              List log entries
+  show <id>                      Show specific entry
+  delete <id>                    Delete an entry
+  digest [options]               Show tiered campaign digest
+
+Add options:
+  --date DATE                    In-world date (e.g., Y3.D45)
+  --date-loose TEXT              Loose date (e.g., 'after the festival')
+  --branch NAME                  Branch/arc name
+  --importance LEVEL             normal, minor, major, critical
+  --characters CHARS             juno:defining,tam:present or JSON
+  --locations LOCS               Comma-separated location IDs
+  --tags TAGS                    Comma-separated tags
+  --session NAME                 Session identifier
+  --memory ID                    Link to a memory
+  --story ID                     Link to a story
+
+List filters:
+  --branch NAME                  Filter by branch
+  --character NAME               Filter by character involvement
+  --location NAME                Filter by location
+  --importance LEVEL             Filter by importance (use major+ for hierarchy)
+  --tag NAME                     Filter by tag
+  --from DATE                    Filter from date
+  --to DATE                      Filter to date
+  --limit N                      Limit results
+  --verbose                      Show full details
+
+Digest options:
+  --character NAME               Filter by character
+  --pillar-limit N               Max pillars to show (default: 10)
+  --arc-sessions N               Sessions for 'recent arc' (default: 20)
+  --current-sessions N           Sessions for 'current' (default: 5)
+
+  Defaults can be configured in campaign/config.json under 'digest' key:
+
+Global options:
+  --json                         Output as JSON
+"""
+
+
 def main():
     global log_entries, campaign_config
 
+    if len(sys.argv) < 2 or sys.argv[1] in ('--help', '-h'):
+        sys.stdout.write(HELP)
+        sys.exit(0 if len(sys.argv) > 1 and sys.argv[1] in ('--help', '-h') else 1)
+
     search_root = Path.cwd()
     campaign_config = load_campaign_config(search_root)
     log_entries = load_log(search_root)
 
-    if len(sys.argv) < 2 or sys.argv[1] in ('--help', '-h'):
-        print("Usage: python log.py <command> [options]")
-        print("\nCommands:")
-        print("  add <summary> [options]        Add a log entry")
-        print("  list [filters...]              List log entries")
-        print("  show <id>                      Show specific entry")
-        print("  delete <id>                    Delete an entry")
-        print("  digest [options]               Show tiered campaign digest")
-        print("\nAdd options:")
-        print("  --date DATE                    In-world date (e.g., Y3.D45)")
-        print("  --date-loose TEXT              Loose date (e.g., 'after the festival')")
-        print("  --branch NAME                  Branch/arc name")
-        print("  --importance LEVEL             normal, minor, major, critical")
-        print("  --characters CHARS             juno:defining,tam:present or JSON")
-        print("  --locations LOCS               Comma-separated location IDs")
-        print("  --tags TAGS                    Comma-separated tags")
-        print("  --session NAME                 Session identifier")
-        print("  --memory ID                    Link to a memory")
-        print("  --story ID                     Link to a story")
-        print("\nList filters:")
-        print("  --branch NAME                  Filter by branch")
-        print("  --character NAME               Filter by character involvement")
-        print("  --location NAME                Filter by location")
-        print("  --importance LEVEL             Filter by importance (use major+ for hierarchy)")
-        print("  --tag NAME                     Filter by tag")
-        print("  --from DATE                    Filter from date")
-        print("  --to DATE                      Filter to date")
-        print("  --limit N                      Limit results")
-        print("  --verbose                      Show full details")
-        print("\nDigest options:")
-        print("  --character NAME               Filter by character")
-        print("  --pillar-limit N               Max pillars to show (default: 10)")
-        print("  --arc-sessions N               Sessions for 'recent arc' (default: 20)")
-        print("  --current-sessions N           Sessions for 'current' (default: 5)")
-        print("\n  Defaults can be configured in campaign/config.json under 'digest' key:")
-        print("\nGlobal options:")
-        print("  --json                         Output as JSON")
-        sys.exit(0 if len(sys.argv) > 1 and sys.argv[1] in ('--help', '-h') else 1)
-
     command = sys.argv[1]
 
     # Parse options
@@ -560,7 +587,7 @@ def main():
         "tag": None,
         "from_date": None,
         "to_date": None,
-        "limit": 0,
+        "limit": None,
         "verbose": False,
         "output_json": False,
         "pillar_limit": None,
@@ -618,7 +645,7 @@ def main():
             opts["to_date"] = sys.argv[i + 1]
             i += 2
         elif arg == "--limit" and i + 1 < len(sys.argv):
-            opts["limit"] = int(sys.argv[i + 1])
+            opts["limit"] = sys.argv[i + 1]
             i += 2
         elif arg == "--verbose":
             opts["verbose"] = True
@@ -627,25 +654,13 @@ def main():
             opts["output_json"] = True
             i += 1
         elif arg == "--pillar-limit" and i + 1 < len(sys.argv):
-            try:
-                opts["pillar_limit"] = int(sys.argv[i + 1])
-            except ValueError:
-                print("Error: --pillar-limit requires an integer value", file=sys.stderr)
-                sys.exit(1)
+            opts["pillar_limit"] = sys.argv[i + 1]
             i += 2
         elif arg == "--arc-sessions" and i + 1 < len(sys.argv):
-            try:
-                opts["arc_sessions"] = int(sys.argv[i + 1])
-            except ValueError:
-                print("Error: --arc-sessions requires an integer value", file=sys.stderr)
-                sys.exit(1)
+            opts["arc_sessions"] = sys.argv[i + 1]
             i += 2
         elif arg == "--current-sessions" and i + 1 < len(sys.argv):
-            try:
-                opts["current_sessions"] = int(sys.argv[i + 1])
-            except ValueError:
-                print("Error: --current-sessions requires an integer value", file=sys.stderr)
-                sys.exit(1)
+            opts["current_sessions"] = sys.argv[i + 1]
             i += 2
         elif not arg.startswith("--") and not positional_set:
             if command == "add":
@@ -687,7 +702,7 @@ def main():
             session=opts["session"],
             from_date=opts["from_date"],
             to_date=opts["to_date"],
-            limit=opts["limit"],
+            limit=int_option(opts, "limit", "--limit") or 0,
             verbose=opts["verbose"],
             output_json=opts["output_json"]
         )
@@ -704,9 +719,9 @@ def main():
     elif command == "digest":
         cmd_digest(
             character=opts["character"],
-            pillar_limit=opts["pillar_limit"],
-            arc_sessions=opts["arc_sessions"],
-            current_sessions=opts["current_sessions"],
+            pillar_limit=int_option(opts, "pillar_limit", "--pillar-limit"),
+            arc_sessions=int_option(opts, "arc_sessions", "--arc-sessions"),
+            current_sessions=int_option(opts, "current_sessions", "--current-sessions"),
             output_json=opts["output_json"]
         )
     else:
@@ -4,15 +4,36 @@
 import json
 import random
 import sys
+from collections import Counter
 from pathlib import Path
 from typing import Dict, List, Optional, Set
 
-from lib import parse_era, parse_session, discover_data, find_item, save_item
+from lib import parse_era, parse_session, parse_options, discover_data, find_item, save_item, build_lookup_index
 
 
 # Memory storage
 memories: Dict[str, Dict] = {}
 
+# Display order and labels for format_memory's metadata, link and connection lines
+META_FIELDS = (
+    ("type", "Type"),
+    ("format", "Format"),
+    ("era", "Era"),
+    ("session", "Session"),
+    ("intensity", "Intensity"),
+    ("perspective", "Perspective"),
+)
+LINK_FIELDS = (
+    ("log_entry", "Log"),
+    ("story", "Story"),
+)
+CONNECTION_FIELDS = (
+    ("characters", "Characters"),
+    ("locations", "Locations"),
+    ("stories", "Stories"),
+    ("related_memories", "Related"),
+)
+
 
 def discover_memories(search_root: Path) -> None:
     """Discover memory files from memories/ folder."""
@@ -183,20 +204,7 @@ def format_memory(mem: Dict, show_text: bool = True) -> str:
     lines.append(f"# {title}")
 
     # Metadata
-    meta = []
-    if mem.get("type"):
-        meta.append(f"Type: {mem['type']}")
-    if mem.get("format"):
-        meta.append(f"Format: {mem['format']}")
-    if mem.get("era"):
-        meta.append(f"Era: {mem['era']}")
-    if mem.get("session"):
-        meta.append(f"Session: {mem['session']}")
-    if mem.get("intensity"):
-        meta.append(f"Intensity: {mem['intensity']}")
-    if mem.get("perspective"):
-        meta.append(f"Perspective: {mem['perspective']}")
-
+    meta = [f"{label}: {mem[key]}" for key, label in META_FIELDS if mem.get(key)]
     if meta:
         lines.append(f"**{' | '.join(meta)}**")
 
@@ -205,29 +213,16 @@ def format_memory(mem: Dict, show_text: bool = True) -> str:
         lines.append(f"*Tags: {', '.join(mem['tags'])}*")
 
     # Cross-references
-    refs = []
-    if mem.get("log_entry"):
-        refs.append(f"Log: {mem['log_entry']}")
-    if mem.get("story"):
-        refs.append(f"Story: {mem['story']}")
+    refs = [f"{label}: {mem[key]}" for key, label in LINK_FIELDS if mem.get(key)]
     if refs:
         lines.append(f"*Links: {' • '.join(refs)}*")
 
     # Connections
     connections = mem.get("connections", {})
-    if any(connections.values()):
-        conn_lines = []
-        if connections.get("characters"):
-            conn_lines.append(f"Characters: {', '.join(connections['characters'])}")
-        if connections.get("locations"):
-            conn_lines.append(f"Locations: {', '.join(connections['locations'])}")
-        if connections.get("stories"):
-            conn_lines.append(f"Stories: {', '.join(connections['stories'])}")
-        if connections.get("related_memories"):
-            conn_lines.append(f"Related: {', '.join(connections['related_memories'])}")
-
-        if conn_lines:
-            lines.append(f"\n*Connected to: {' • '.join(conn_lines)}*")
+    conn_lines = [f"{label}: {', '.join(connections[key])}"
+                  for key, label in CONNECTION_FIELDS if connections.get(key)]
+    if conn_lines:
+        lines.append(f"\n*Connected to: {' • '.join(conn_lines)}*")
 
     # Text
     if show_text and mem.get("text"):
@@ -440,12 +435,18 @@ def cmd_connections(mem_id: str) -> None:
         print("No connections found")
 
 
-def cmd_chain(mem_id: str, visited: Optional[Set[str]] = None) -> None:
+def cmd_chain(
+    mem_id: str,
+    visited: Optional[Set[str]] = None,
+    index: Optional[Dict[str, Dict]] = None
+) -> None:
     """Follow related_memories to show narrative thread."""
     if visited is None:
         visited = set()
+    if index is None:
+        index = build_lookup_index(memories)
 
-    mem = find_item(memories, mem_id, "Memory")
+    mem = find_item(memories, mem_id, "Memory", index=index)
     actual_id = mem.get("id", mem_id)
 
     if actual_id in visited:
@@ -463,15 +464,8 @@ def cmd_chain(mem_id: str, visited: Optional[Set[str]] = None) -> None:
         print(f"↓ Related memories:\n")
         for rel_id in related:
             if rel_id not in visited:
-                # Check if related memory exists
-                rel_exists = False
-                for mid in memories.keys():
-                    if mid == rel_id:
-                        rel_exists = True
-                        break
-
-                if rel_exists:
-                    cmd_chain(rel_id, visited)
+                if rel_id in memories:
+                    cmd_chain(rel_id, visited, index)
                 else:
                     print(f"  [Memory '{rel_id}' referenced but not found]\n")
 
@@ -524,47 +518,30 @@ def cmd_meta(campaign: Optional[str] = None) -> None:
         print("No memories found")
         return
 
-    # Count types
-    types: Dict[str, int] = {}
-    for m in filtered:
-        t = m.get("type", "unknown")
-        types[t] = types.get(t, 0) + 1
-
-    # Count tags
-    tags: Dict[str, int] = {}
-    for m in filtered:
-        for tag in m.get("tags", []):
-            tags[tag] = tags.get(tag, 0) + 1
-
-    # Count intensities
-    intensities: Dict[str, int] = {}
-    for m in filtered:
-        i = m.get("intensity", "unknown")
-        intensities[i] = intensities.get(i, 0) + 1
-
-    # Count perspectives
-    perspectives: Dict[str, int] = {}
+    # Count types, tags, intensities, perspectives and sessions in one pass
+    types: Counter = Counter()
+    tags: Counter = Counter()
+    intensities: Counter = Counter()
+    perspectives: Counter = Counter()
+    sessions: Counter = Counter()
     for m in filtered:
-        p = m.get("perspective", "unknown")
-        perspectives[p] = perspectives.get(p, 0) + 1
-
-    # Count sessions
-    sessions: Dict[str, int] = {}
-    for m in filtered:
-        s = m.get("session", "unknown")
-        sessions[s] = sessions.get(s, 0) + 1
+        types[m.get("type", "unknown")] += 1
+        tags.update(m.get("tags", []))
+        intensities[m.get("intensity", "unknown")] += 1
+        perspectives[m.get("perspective", "unknown")] += 1
+        sessions[m.get("session", "unknown")] += 1
 
     # Print results
     print(f"\n## Types")
-    for k, v in sorted(types.items(), key=lambda x: -x[1]):
+    for k, v in types.most_common():
         print(f"  {k}: {v}")
 
     print(f"\n## Intensities")
-    for k, v in sorted(intensities.items(), key=lambda x: -x[1]):
+    for k, v in intensities.most_common():
         print(f"  {k}: {v}")
 
     print(f"\n## Perspectives")
-    for k, v in sorted(perspectives.items(), key=lambda x: -x[1]):
+    for k, v in perspectives.most_common():
         print(f"  {k}: {v}")
 
     print(f"\n## Sessions")
@@ -572,7 +549,7 @@ def cmd_meta(campaign: Optional[str] = None) -> None:
         print(f"  {k}: {v}")
 
     print(f"\n## Top Tags")
-    for k, v in sorted(tags.items(), key=lambda x: -x[1])[:15]:
+    for k, v in tags.most_common(15):
         print(f"  {k}: {v}")
 
     print(f"\n**Total: {len(filtered)} memories**")
@@ -669,7 +646,84 @@ def cmd_create(
         print(f"  Saved to: {path}")
 
 
+FLAGS = {
+    "--campaign": ("campaign", True),
+    "--character": ("character", True),
+    "--location": ("location", True),
+    "--type": ("mem_type", True),
+    "--format": ("mem_format", True),
+    "--tag": ("tag", True),
+    "--era": ("era", True),
+    "--session": ("session", True),
+    "--intensity": ("intensity", True),
+    "--perspective": ("perspective", True),
+    "--short": ("short", False),
+    "--count": ("count", True),
+    "--by-era": ("by_era", False),
+    "--title": ("title", True),
+    "--text": ("text", True),
+    "--characters": ("characters", True),
+    "--locations": ("locations", True),
+    "--tags": ("tags", True),
+    "--log-entry": ("log_entry", True),
+    "--story": ("story", True),
+    "--json": ("output_json", False),
+}
+
+HELP = """\
+Usage: python memories.py <command> [options]
+
+Commands:
+  create [id] --title T --text T ...   Create a new memory
+  list [filters...]                    List memories
+  list --short [filters...]            List with details (no text)
+  get <id>                             Get specific memory
+  random [filters...]                  Get random memory
+  recent [--campaign NAME] [--count N] Show recent memories
+  recent --by-era                      Sort by era instead of session
+  search <query> [--campaign NAME]     Full-text search
+  connections <id>                     Show all connections
+  chain <id>                           Follow related memories
+  character <name>                     All memories involving character
+  location <name>                      All memories at location
+  meta [--campaign NAME]               Show metadata summary
+
+Create options:
+  --title TITLE          Memory title (required)
+  --text TEXT            Memory text (required)
+  --campaign NAME        Campaign identifier
+  --type TYPE            vivid-moment, quiet-moment, revelation, etc.
+  --format FORMAT        vivid, sequential, or summary
+  --era ERA              Time period (e.g., Y3.D45)
+  --session SESSION      Session identifier (e.g., s03)
+  --intensity LEVEL      low, medium, high
+  --perspective POV      first-person, third-person, omniscient
+  --characters CHARS     Comma-separated character IDs
+  --locations LOCS       Comma-separated location IDs
+  --tags TAGS            Comma-separated tags
+  --log-entry ID         Link to a log entry
+  --story ID             Link to a story
+  --json                 Output created memory as JSON
+
+Filters (for list/random):
+  --campaign NAME        Filter by campaign
+  --character NAME       Filter by character (single)
+  --location NAME        Filter by location (single)
+  --type TYPE            Filter by type
+  --format FORMAT        Filter by format (vivid/sequential/summary)
+  --tag TAG              Filter by tag
+  --era ERA              Filter by era
+  --session SESSION      Filter by session
+  --intensity LEVEL      Filter by intensity
+  --perspective VIEW     Filter by perspective
+"""
+
+
 def main():
+    if len(sys.argv) < 2 or sys.argv[1] in ('--help', '-h'):
+        sys.stdout.write(HELP)
+        sys.exit(0 if len(sys.argv) > 1 and sys.argv[1] in ('--help', '-h') else 1)
+
     # Find search root
     search_root = Path.cwd()
 
@@ -679,221 +733,111 @@ def main():
     # Validate connections (warnings only, doesn't exit)
     validate_connections()
 
-    if len(sys.argv) < 2 or sys.argv[1] in ('--help', '-h'):
-        print("Usage: python memories.py <command> [options]")
-        print("\nCommands:")
-        print("  create [id] --title T --text T ...   Create a new memory")
-        print("  list [filters...]                    List memories")
-        print("  list --short [filters...]            List with details (no text)")
-        print("  get <id>                             Get specific memory")
-        print("  random [filters...]                  Get random memory")
-        print("  recent [--campaign NAME] [--count N] Show recent memories")
-        print("  recent --by-era                      Sort by era instead of session")
-        print("  search <query> [--campaign NAME]     Full-text search")
-        print("  connections <id>                     Show all connections")
-        print("  chain <id>                           Follow related memories")
-        print("  character <name>                     All memories involving character")
-        print("  location <name>                      All memories at location")
-        print("  meta [--campaign NAME]               Show metadata summary")
-        print("\nCreate options:")
-        print("  --title TITLE          Memory title (required)")
-        print("  --text TEXT            Memory text (required)")
-        print("  --campaign NAME        Campaign identifier")
-        print("  --type TYPE            vivid-moment, quiet-moment, revelation, etc.")
-        print("  --format FORMAT        vivid, sequential, or summary")
-        print("  --era ERA              Time period (e.g., Y3.D45)")
-        print("  --session SESSION      Session identifier (e.g., s03)")
-        print("  --intensity LEVEL      low, medium, high")
-        print("  --perspective POV      first-person, third-person, omniscient")
-        print("  --characters CHARS     Comma-separated character IDs")
-        print("  --locations LOCS       Comma-separated location IDs")
-        print("  --tags TAGS            Comma-separated tags")
-        print("  --log-entry ID         Link to a log entry")
-        print("  --story ID             Link to a story")
-        print("  --json                 Output created memory as JSON")
-        print("\nFilters (for list/random):")
-        print("  --campaign NAME        Filter by campaign")
-        print("  --character NAME       Filter by character (single)")
-        print("  --location NAME        Filter by location (single)")
-        print("  --type TYPE            Filter by type")
-        print("  --format FORMAT        Filter by format (vivid/sequential/summary)")
-        print("  --tag TAG              Filter by tag")
-        print("  --era ERA              Filter by era")
-        print("  --session SESSION      Filter by session")
-        print("  --intensity LEVEL      Filter by intensity")
-        print("  --perspective VIEW     Filter by perspective")
-        sys.exit(0 if len(sys.argv) > 1 and sys.argv[1] in ('--help', '-h') else 1)
-
     command = sys.argv[1]
 
     # Parse options
-    campaign = None
-    character = None
-    location = None
-    mem_type = None
-    mem_format = None
-    tag = None
-    era = None
-    session = None
-    intensity = None
-    perspective = None
-    short = False
-    count = 5
-    by_era = False
-    query = None
-    mem_id = None
-    # Create-specific options
-    title = None
-    text = None
-    characters_list = None
-    locations_list = None
-    tags_list = None
-    log_entry = None
-    story_link = None
-    output_json = False
-
-    i = 2
-    while i < len(sys.argv):
-        arg = sys.argv[i]
-        if arg == "--campaign" and i + 1 < len(sys.argv):
-            campaign = sys.argv[i + 1]
-            i += 2
-        elif arg == "--character" and i + 1 < len(sys.argv):
-            character = sys.argv[i + 1]
-            i += 2
-        elif arg == "--location" and i + 1 < len(sys.argv):
-            location = sys.argv[i + 1]
-            i += 2
-        elif arg == "--type" and i + 1 < len(sys.argv):
-            mem_type = sys.argv[i + 1]
-            i += 2
-        elif arg == "--format" and i + 1 < len(sys.argv):
-            mem_format = sys.argv[i + 1]
-            i += 2
-        elif arg == "--tag" and i + 1 < len(sys.argv):
-            tag = sys.argv[i + 1]
-            i += 2
-        elif arg == "--era" and i + 1 < len(sys.argv):
-            era = sys.argv[i + 1]
-            i += 2
-        elif arg == "--session" and i + 1 < len(sys.argv):
-            session = sys.argv[i + 1]
-            i += 2
-        elif arg == "--intensity" and i + 1 < len(sys.argv):
-            intensity = sys.argv[i + 1]
-            i += 2
-        elif arg == "--perspective" and i + 1 < len(sys.argv):
-            perspective = sys.argv[i + 1]
-            i += 2
-        elif arg == "--short":
-            short = True
-            i += 1
-        elif arg == "--count" and i + 1 < len(sys.argv):
-            count = int(sys.argv[i + 1])
-            i += 2
-        elif arg == "--by-era":
-            by_era = True
-            i += 1
-        elif arg == "--title" and i + 1 < len(sys.argv):
-            title = sys.argv[i + 1]
-            i += 2
-        elif arg == "--text" and i + 1 < len(sys.argv):
-            text = sys.argv[i + 1]
-            i += 2
-        elif arg == "--characters" and i + 1 < len(sys.argv):
-            characters_list = sys.argv[i + 1]
-            i += 2
-        elif arg == "--locations" and i + 1 < len(sys.argv):
-            locations_list = sys.argv[i + 1]
-            i += 2
-        elif arg == "--tags" and i + 1 < len(sys.argv):
-            tags_list = sys.argv[i + 1]
-            i += 2
-        elif arg == "--log-entry" and i + 1 < len(sys.argv):
-            log_entry = sys.argv[i + 1]
-            i += 2
-        elif arg == "--story" and i + 1 < len(sys.argv):
-            story_link = sys.argv[i + 1]
-            i += 2
-        elif arg == "--json":
-            output_json = True
-            i += 1
-        elif not arg.startswith("--"):
-            # Positional argument (query or id)
-            if command == "search":
-                query = arg
-            else:
-                mem_id = arg
-            i += 1
-        else:
-            print(f"Unknown option: {arg}", file=sys.stderr)
-            sys.exit(1)
+    opts = {
+        "campaign": None,
+        "character": None,
+        "location": None,
+        "mem_type": None,
+        "mem_format": None,
+        "tag": None,
+        "era": None,
+        "session": None,
+        "intensity": None,
+        "perspective": None,
+        "short": False,
+        "count": 5,
+        "by_era": False,
+        # Create-specific options
+        "title": None,
+        "text": None,
+        "characters": None,
+        "locations": None,
+        "tags": None,
+        "log_entry": None,
+        "story": None,
+        "output_json": False,
+    }
+
+    # Positional argument is the search query or the memory/character/location id
+    positional = parse_options(sys.argv[2:], FLAGS, opts)
+    target = positional[-1] if positional else None
+
+    try:
+        count = int(opts["count"])
+    except ValueError:
+        print("Error: --count requires an integer value", file=sys.stderr)
+        sys.exit(1)
 
     # Execute command
     if command == "create":
-        if not title:
+        if not opts["title"]:
             print("Error: --title required for create", file=sys.stderr)
             sys.exit(1)
-        if not text:
+        if not opts["text"]:
             print("Error: --text required for create", file=sys.stderr)
             sys.exit(1)
         cmd_create(
-            mem_id=mem_id,
-            title=title,
-            text=text,
-            campaign=campaign,
-            mem_type=mem_type,
-            mem_format=mem_format,
-            era=era,
-            session=session,
-            intensity=intensity,
-            perspective=perspective,
-            characters=characters_list,
-            locations=locations_list,
-            tags=tags_list,
-            log_entry=log_entry,
-            story=story_link,
-            output_json=output_json
+            mem_id=target,
+            title=opts["title"],
+            text=opts["text"],
+            campaign=opts["campaign"],
+            mem_type=opts["mem_type"],
+            mem_format=opts["mem_format"],
+            era=opts["era"],
+            session=opts["session"],
+            intensity=opts["intensity"],
+            perspective=opts["perspective"],
+            characters=opts["characters"],
+            locations=opts["locations"],
+            tags=opts["tags"],
+            log_entry=opts["log_entry"],
+            story=opts["story"],
+            output_json=opts["output_json"]
         )
     elif command == "list":
-        cmd_list(campaign, character, location, mem_type, mem_format, tag, era, session,
-                 intensity, perspective, short)
+        cmd_list(opts["campaign"], opts["character"], opts["location"], opts["mem_type"],
+                 opts["mem_format"], opts["tag"], opts["era"], opts["session"],
+                 opts["intensity"], opts["perspective"], opts["short"])
     elif command == "get":
-        if not mem_id:
+        if not target:
             print("Error: memory id required for 'get'", file=sys.stderr)
             sys.exit(1)
-        cmd_get(mem_id)
+        cmd_get(target)
     elif command == "random":
-        cmd_random(campaign, character, location, mem_type, mem_format, tag, era, intensity)
+        cmd_random(opts["campaign"], opts["character"], opts["location"], opts["mem_type"],
+                   opts["mem_format"], opts["tag"], opts["era"], opts["intensity"])
     elif command == "recent":
-        cmd_recent(campaign, count, by_era)
+        cmd_recent(opts["campaign"], count, opts["by_era"])
     elif command == "search":
-        if not query:
+        if not target:
             print("Error: search query required", file=sys.stderr)
             sys.exit(1)
-        cmd_search(query, campaign)
+        cmd_search(target, opts["campaign"])
     elif command == "connections":
-        if not mem_id:
+        if not target:
             print("Error: memory id required for 'connections'", file=sys.stderr)
             sys.exit(1)
-        cmd_connections(mem_id)
+        cmd_connections(target)
     elif command == "chain":
-        if not mem_id:
+        if not target:
             print("Error: memory id required for 'chain'", file=sys.stderr)
             sys.exit(1)
-        cmd_chain(mem_id)
+        cmd_chain(target)
     elif command == "character":
-        if not mem_id:
+        if not target:
             print("Error: character name required", file=sys.stderr)
             sys.exit(1)
-        cmd_character(mem_id)
+        cmd_character(target)
     elif command == "location":
-        if not mem_id:
+        if not target:
             print("Error: location name required", file=sys.stderr)
             sys.exit(1)
-        cmd_location(mem_id)
+        cmd_location(target)
     elif command == "meta":
-        cmd_meta(campaign)
+        cmd_meta(opts["campaign"])
     else:
         print(f"Unknown command: {command}", file=sys.stderr)
         sys.exit(1)
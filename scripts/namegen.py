@@ -423,7 +423,24 @@ def list_groups(nameset_id: str):
         print(f"    Last names: {last_count}")
 
 
+HELP = """\
+Usage: python namegen.py <command> [options]
+
+Commands:
+  full --nameset NAME [--count N] [--group G] [--gender G]
+       Generate name(s) from nameset
+  groups --nameset NAME
+       List groups in a nameset
+  list
+       List available namesets
+"""
+
+
 def main():
+    if len(sys.argv) < 2 or sys.argv[1] in ('--help', '-h'):
+        sys.stdout.write(HELP)
+        sys.exit(0 if len(sys.argv) > 1 and sys.argv[1] in ('--help', '-h') else 1)
+
     # Find repo root (look for .git or assume parent of tools/)
     script_dir = Path(__file__).parent
     repo_root = script_dir.parent
@@ -431,18 +448,6 @@ def main():
     # Load namesets
     discover_namesets(repo_root)
 
-    # Parse command line
-    if len(sys.argv) < 2 or sys.argv[1] in ('--help', '-h'):
-        print("Usage: python namegen.py <command> [options]")
-        print("\nCommands:")
-        print("  full --nameset NAME [--count N] [--group G] [--gender G]")
-        print("       Generate name(s) from nameset")
-        print("  groups --nameset NAME")
-        print("       List groups in a nameset")
-        print("  list")
-        print("       List available namesets")
-        sys.exit(0 if len(sys.argv) > 1 and sys.argv[1] in ('--help', '-h') else 1)
-
     command = sys.argv[1]
 
     # Parse options
@@ -408,24 +408,29 @@ def print_omni(reading):
 # CLI
 # =============================================================================
 
+HELP = """\
+Usage: python oracle.py <command> [args]
+
+Commands:
+  axis              Multi-axis reading (tone/direction/element/action/twist)
+  omni              Full reading from all systems
+  tarot [n]         Draw tarot card(s), default 1
+  rune [n]          Draw rune(s), default 1
+  iching            Cast I Ching hexagram
+  fate [likelihood] Yes/no oracle (impossible/unlikely/even/likely/certain)
+  prompt            Action + Theme word pair
+
+Examples:
+  python oracle.py axis
+  python oracle.py omni
+  python oracle.py tarot 3
+  python oracle.py fate likely
+"""
+
+
 def print_usage():
     """Print usage information."""
-    print("Usage: python oracle.py <command> [args]")
-    print()
-    print("Commands:")
-    print("  axis              Multi-axis reading (tone/direction/element/action/twist)")
-    print("  omni              Full reading from all systems")
-    print("  tarot [n]         Draw tarot card(s), default 1")
-    print("  rune [n]          Draw rune(s), default 1")
-    print("  iching            Cast I Ching hexagram")
-    print("  fate [likelihood] Yes/no oracle (impossible/unlikely/even/likely/certain)")
-    print("  prompt            Action + Theme word pair")
-    print()
-    print("Examples:")
-    print("  python oracle.py axis")
-    print("  python oracle.py omni")
-    print("  python oracle.py tarot 3")
-    print("  python oracle.py fate likely")
+    sys.stdout.write(HELP)
 
 
 def main():
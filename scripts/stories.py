@@ -4,6 +4,7 @@
 import json
 import random
 import sys
+from collections import Counter
 from pathlib import Path
 from typing import Dict, List, Optional
 
@@ -112,39 +113,22 @@ def cmd_meta(campaign: str) -> None:
         print("No stories found")
         return
 
-    # Count themes
-    themes: Dict[str, int] = {}
+    # Count themes, moods, collections, eras and source files in one pass
+    themes: Counter = Counter()
+    moods: Counter = Counter()
+    collections: Counter = Counter()
+    eras: Counter = Counter()
+    sources: Counter = Counter()
     for s in stories:
-        for t in s.get("themes", []):
-            themes[t] = themes.get(t, 0) + 1
-
-    # Count moods
-    moods: Dict[str, int] = {}
-    for s in stories:
-        m = s.get("mood", "unknown")
-        moods[m] = moods.get(m, 0) + 1
-
-    # Count collections
-    collections: Dict[str, int] = {}
-    for s in stories:
-        c = s.get("collection", "unknown")
-        collections[c] = collections.get(c, 0) + 1
-
-    # Count eras
-    eras: Dict[str, int] = {}
-    for s in stories:
-        e = s.get("era", "unknown")
-        eras[e] = eras.get(e, 0) + 1
-
-    # Count source files
-    sources: Dict[str, int] = {}
-    for s in stories:
-        src = s.get("source", "unknown")
-        sources[src] = sources.get(src, 0) + 1
+        themes.update(s.get("themes", []))
+        moods[s.get("mood", "unknown")] += 1
+        collections[s.get("collection", "unknown")] += 1
+        eras[s.get("era", "unknown")] += 1
+        sources[s.get("source", "unknown")] += 1
 
     # Print results
     print(f"\n## Collections")
-    for k, v in sorted(collections.items(), key=lambda x: -x[1]):
+    for k, v in collections.most_common():
         print(f"  {k}: {v}")
 
     print(f"\n## Eras")
@@ -152,15 +136,15 @@ def cmd_meta(campaign: str) -> None:
         print(f"  {k}: {v}")
 
     print(f"\n## Moods")
-    for k, v in sorted(moods.items(), key=lambda x: -x[1]):
+    for k, v in moods.most_common():
         print(f"  {k}: {v}")
 
     print(f"\n## Themes")
-    for k, v in sorted(themes.items(), key=lambda x: -x[1]):
+    for k, v in themes.most_common():
         print(f"  {k}: {v}")
 
     print(f"\n## Sources")
-    for k, v in sorted(sources.items(), key=lambda x: -x[1]):
+    for k, v in sources.most_common():
         print(f"  {k}: {v}")
 
     print(f"\n**Total: {len(stories)} stories**")
@@ -370,7 +354,44 @@ def cmd_create(
         print(f"  Saved to: {path}")
 
 
+HELP = """\
+Usage: python stories.py <command> [options]
+
+Commands:
+  create [id] --title T --text T --campaign C ...
+                                           Create a new story
+  meta --campaign NAME                     Show available tags/metadata with counts
+  list --campaign NAME [filters...]        List stories
+  random --campaign NAME [filters...]      Get random story
+  get --campaign NAME --story ID           Get specific story text
+  show --campaign NAME --story ID          Show story with metadata
+
+Create options:
+  --title TITLE        Story title (required)
+  --text TEXT          Story text (required)
+  --campaign NAME      Campaign identifier (required)
+  --collection COLL    Collection type (told, untold, historical, etc.)
+  --teller ID          Character ID of storyteller
+  --themes THEMES      Comma-separated themes
+  --characters CHARS   Comma-separated character IDs
+  --locations LOCS     Comma-separated location IDs
+  --era ERA            Time period
+  --mood MOOD          Story mood
+  --json               Output as JSON
+
+Filters (for list/random):
+  --collection COLL    Filter by collection (told/private)
+  --theme TAG          Filter by theme
+  --mood MOOD          Filter by mood
+  --era ERA            Filter by era (partial match)
+"""
+
+
 def main():
+    if len(sys.argv) < 2 or sys.argv[1] in ('--help', '-h'):
+        sys.stdout.write(HELP)
+        sys.exit(0 if len(sys.argv) > 1 and sys.argv[1] in ('--help', '-h') else 1)
+
     # Find repo root
     script_dir = Path(__file__).parent
     repo_root = script_dir.parent
@@ -378,36 +399,6 @@ def main():
     # Load story collections
     discover_stories(repo_root)
 
-    # Parse command line
-    if len(sys.argv) < 2 or sys.argv[1] in ('--help', '-h'):
-        print("Usage: python stories.py <command> [options]")
-        print("\nCommands:")
-        print("  create [id] --title T --text T --campaign C ...")
-        print("                                           Create a new story")
-        print("  meta --campaign NAME                     Show available tags/metadata with counts")
-        print("  list --campaign NAME [filters...]        List stories")
-        print("  random --campaign NAME [filters...]      Get random story")
-        print("  get --campaign NAME --story ID           Get specific story text")
-        print("  show --campaign NAME --story ID          Show story with metadata")
-        print("\nCreate options:")
-        print("  --title TITLE        Story title (required)")
-        print("  --text TEXT          Story text (required)")
-        print("  --campaign NAME      Campaign identifier (required)")
-        print("  --collection COLL    Collection type (told, untold, historical, etc.)")
-        print("  --teller ID          Character ID of storyteller")
-        print("  --themes THEMES      Comma-separated themes")
-        print("  --characters CHARS   Comma-separated character IDs")
-        print("  --locations LOCS     Comma-separated location IDs")
-        print("  --era ERA            Time period")
-        print("  --mood MOOD          Story mood")
-        print("  --json               Output as JSON")
-        print("\nFilters (for list/random):")
-        print("  --collection COLL    Filter by collection (told/private)")
-        print("  --theme TAG          Filter by theme")
-        print("  --mood MOOD          Filter by mood")
-        print("  --era ERA            Filter by era (partial match)")
-        sys.exit(0 if len(sys.argv) > 1 and sys.argv[1] in ('--help', '-h') else 1)
-
     command = sys.argv[1]
 
     # Parse options
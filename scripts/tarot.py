@@ -59,11 +59,16 @@ def draw_spread(num_cards):
         print(f"{i}. {card}")
 
 
+HELP = """\
+Usage: python tarot.py [num_cards]
+  No arguments: draw single card
+  num_cards: draw a spread of N cards (1-10)
+"""
+
+
 def main():
     if len(sys.argv) > 1 and sys.argv[1] in ('--help', '-h'):
-        print("Usage: python tarot.py [num_cards]")
-        print("  No arguments: draw single card")
-        print("  num_cards: draw a spread of N cards (1-10)")
+        sys.stdout.write(HELP)
         sys.exit(0)
 
     if len(sys.argv) == 1:
@@ -76,14 +81,10 @@ def main():
             draw_spread(num_cards)
         except ValueError:
             print(f"Error: '{sys.argv[1]}' is not a valid number")
-            print("Usage: python tarot.py [num_cards]")
-            print("  No arguments: draw single card")
-            print("  num_cards: draw a spread of N cards (1-10)")
+            sys.stdout.write(HELP)
             sys.exit(1)
     else:
-        print("Usage: python tarot.py [num_cards]")
-        print("  No arguments: draw single card")
-        print("  num_cards: draw a spread of N cards (1-10)")
+        sys.stdout.write(HELP)
         sys.exit(1)
 
 